@@ -1,207 +1,34 @@
 import tkinter as tk
 import tkinter.messagebox as messagebox
-import time
-from PIL import Image, ImageDraw, ImageTk
+from PIL import ImageTk
 
-class Node():
-    def __init__(self, state, parent, action):
-        self.state = state
-        self.parent = parent
-        self.action = action
-
-class StackFrontier():
-    def __init__(self):
-        self.frontier = []
-
-    def add(self, node):
-        self.frontier.append(node)
-
-    def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
-
-    def empty(self):
-        return len(self.frontier) == 0
-
-    def remove(self):
-        if self.empty():
-            raise Exception("empty frontier")
-        else:
-            node = self.frontier.pop()  # LIFO para DFS
-            return node
-
-class QueueFrontier(StackFrontier):
-    def remove(self):
-        if self.empty():
-            raise Exception("empty frontier")
-        else:
-            node = self.frontier.pop(0)  # FIFO para BFS
-            return node
-
-class Maze():
-    def __init__(self, filename):
-        with open(filename) as f:
-            contents = f.read()
-
-        if contents.count("A") != 1 or contents.count("B") != 1:
-            raise Exception("Laberinto debe tener exactamente un inicio 'A' y un final 'B'")
-
-        contents = contents.splitlines()
-        self.height = len(contents)
-        self.width = max(len(line) for line in contents)
-
-        self.walls = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if contents[i][j] == "A":
-                        self.start = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == "B":
-                        self.goal = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == " ":
-                        row.append(False)
-                    else:
-                        row.append(True)
-                except IndexError:
-                    row.append(False)
-            self.walls.append(row)
-
-        self.solution = None
-        self.explored = set()
-
-    def print(self):
-        solution = self.solution[1] if self.solution is not None else None
-        print()
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-                if col:
-                    print("█", end="")
-                elif (i, j) == self.start:
-                    print("A", end="")
-                elif (i, j) == self.goal:
-                    print("B", end="")
-                elif solution is not None and (i, j) in solution:
-                    print("*", end="")
-                else:
-                    print(" ", end="")
-            print()
-        print()
-
-    def neighbors(self, state):
-        row, col = state
-        candidates = [
-            ("up", (row - 1, col)),
-            ("down", (row + 1, col)),
-            ("left", (row, col - 1)),
-            ("right", (row, col + 1))
-        ]
-
-        result = []
-        for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]:
-                result.append((action, (r, c)))
-        return result
-
-    def solve(self, step_callback=None):
-        self.num_explored = 0
-
-        start = Node(state=self.start, parent=None, action=None)
-        frontier = selected_frontier()  # Usa la frontera seleccionada
-        frontier.add(start)
-
-        self.explored = set()
-
-        while True:
-            if frontier.empty():
-                raise Exception("no solution")
-
-            node = frontier.remove()
-            self.num_explored += 1
-
-            if step_callback:
-                step_callback(node.state)
-
-            if node.state == self.goal:
-                actions = []
-                cells = []
-                while node.parent is not None:
-                    actions.append(node.action)
-                    cells.append(node.state)
-                    node = node.parent
-                actions.reverse()
-                cells.reverse()
-                self.solution = (actions, cells)
-                return
-
-            self.explored.add(node.state)
-
-            for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action)
-                    frontier.add(child)
-
-    def output_image(self, filename, show_solution=True, show_explored=False, current_state=None):
-        cell_size = 50
-        cell_border = 2
-
-# Cargar imágenes
-   
-    
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
-
-        solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-                if col:
-                    fill = (40, 40, 40)
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
-                elif (i, j) == self.goal:
-                    fill = (0, 171, 28)
-                elif current_state is not None and (i, j) == current_state:
-                    fill = (255, 255, 0)
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (220, 235, 113)
-                elif show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)
-                else:
-                    fill = (237, 240, 252)
-
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
-                )
-
-        img.save(filename)
+from laberinto import Maze
+from laberinto.animation import Animation, SearchRun
+from laberinto.render import MazeRenderer
 
 def seleccionar_nivel(nivel):
     global solving_mode
 
+    detener_animacion()
+
     filename = f"laberinto{nivel}.txt"
     m = Maze(filename)
     print(f"Laberinto nivel {nivel}:")
     m.print()
     print("Selecciona el algoritmo y luego inicia el recorrido.")
 
-    def paso_a_paso(state):
-        actualizar_imagen(m, current_state=state)
-        ventana.update()
-        time.sleep(0.1)
+    def mostrar_pasos(states):
+        for state in states:
+            renderer.step(state)  # Solo se repintan las celdas que cambian
+        mostrar_imagen()
 
-    def iniciar_recorrido():
-        if solving_mode == "None":
-            messagebox.showwarning("Selección de Algoritmo", "Por favor, selecciona un algoritmo.")
+    def terminar_recorrido(run):
+        global animacion
+        animacion = None
+        if run.error is not None:
+            messagebox.showerror("Sin Solución", f"Nivel {nivel}: {run.error}")
             return
-        
-        m.solve(step_callback=paso_a_paso)
+
         print("Estados explorados:", m.num_explored)
         print("Solución:")
         m.print()
@@ -211,8 +38,22 @@ def seleccionar_nivel(nivel):
 
         # Mostrar un mensaje cuando se termine el nivel
         messagebox.showinfo("Nivel Completo", f"Nivel {nivel} completado usando {selected_algorithm}.")
-        # Detener la animación
-        ventana.update()
+
+    def iniciar_recorrido():
+        global animacion
+        if solving_mode == "None":
+            messagebox.showwarning("Selección de Algoritmo", "Por favor, selecciona un algoritmo.")
+            return
+
+        detener_animacion()
+        m.solution, m.explored, m.num_explored = None, set(), 0  # Sin el recorrido anterior
+        renderer.load(m)
+        mostrar_imagen()
+
+        # La búsqueda corre en un hilo y la animación muestra un paso cada 100 ms con after(),
+        # sin bloquear la ventana
+        animacion = Animation(ventana, SearchRun(m, selected_algorithm), mostrar_pasos, terminar_recorrido,
+                              delay=100).start()
 
     # Mostrar el laberinto
     actualizar_imagen(m)
@@ -224,20 +65,35 @@ def seleccionar_nivel(nivel):
     boton_iniciar.config(command=iniciar_recorrido)
 
 def actualizar_imagen(m, current_state=None):
-    m.output_image("laberinto_gui.png", show_explored=True, current_state=current_state)
-    img = Image.open("laberinto_gui.png")
-    img = img.resize((400, 400))
-    img_tk = ImageTk.PhotoImage(img)
-    label_img.config(image=img_tk)
-    label_img.image = img_tk
+    global renderer
+    if renderer is None or renderer.maze is not m:
+        renderer = MazeRenderer(m, size=(400, 400))
+    else:
+        renderer.load(m, current_state=current_state)
+    mostrar_imagen()
+
+def mostrar_imagen():
+    # Pinta las celdas cambiadas y actualiza la imagen de Tk en su sitio, sin ficheros
+    renderer.flush()
+    img_tk = getattr(label_img, "image", None)
+    if img_tk is None:
+        img_tk = ImageTk.PhotoImage(renderer.image)
+        label_img.config(image=img_tk)
+        label_img.image = img_tk
+    else:
+        img_tk.paste(renderer.image)
+
+def detener_animacion():
+    global animacion
+    if animacion is not None:
+        animacion.cancel()
+        animacion = None
 
 def set_frontier(frontera):
-    global selected_frontier, selected_algorithm, solving_mode
+    global selected_algorithm, solving_mode
     if frontera == "BFS":
-        selected_frontier = QueueFrontier
         selected_algorithm = "BFS"
     else:
-        selected_frontier = StackFrontier
         selected_algorithm = "DFS"
     indicador_algoritmo.config(text=f"Algoritmo Seleccionado: {selected_algorithm}")
     solving_mode = frontera
@@ -285,8 +141,9 @@ indicador_algoritmo = tk.Label(frame_algoritmo, text="Algoritmo Seleccionado: Ni
                               bg="#f0f0f0")
 indicador_algoritmo.pack()
 
-selected_frontier = None
 selected_algorithm = "Ninguno"
 solving_mode = "None"
+renderer = None
+animacion = None
 
 ventana.mainloop()
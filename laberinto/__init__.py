@@ -0,0 +1,14 @@
+"""Núcleo del solucionador de laberintos, sin dependencias de Tk ni de PIL.
+
+    from laberinto import Maze, solve
+    result = solve(Maze("laberinto5.txt"), algorithm="A*")
+"""
+
+from .cache import SolutionCache
+from .corridors import CorridorGraph
+from .frontiers import (Node, StackFrontier, QueueFrontier, GreedyFrontier, AStarFrontier, BucketFrontier,
+                        DijkstraFrontier)
+from .maze import Maze
+from .metrics import SearchMetrics
+from .search import ALGORITHMS, INDEXED_ALGORITHMS, SolveResult, solve
+from .wavefront import distance_field, path_from_field
@@ -0,0 +1,155 @@
+import threading
+
+from .search import solve
+
+# Animación de búsquedas sin bloquear la interfaz: la búsqueda corre a toda velocidad en un
+# hilo y va anotando los estados expandidos; la interfaz los consume con after(), al ritmo y
+# con el salto de fotogramas que se elijan, y puede pausar, reanudar o cancelar. El hilo solo
+# lee el laberinto: los índices que consulta solve se construyen antes, al crear el SearchRun
+# desde el hilo de la interfaz, y el resultado se copia en él al terminar, desde ese hilo.
+
+class Cancelled(Exception):
+    pass
+
+class SearchRun():
+    def __init__(self, maze, algorithm="BFS", **options):
+        self.maze = maze
+        self.algorithm = algorithm
+        self.options = options
+        self.steps = []  # Estados expandidos, en orden
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        maze.components()  # Aquí y no en el hilo, que solo lo consulta
+        if options.get("indexed"):
+            maze.corridors()
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def run(self):
+        try:
+            self.result = solve(self.maze, algorithm=self.algorithm, step_callback=self.record, **self.options)
+        except Cancelled:
+            pass
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done.set()
+
+    def record(self, state):
+        if self.cancelled:
+            raise Cancelled()
+        self.steps.append(state)
+
+    def cancel(self):
+        self.cancelled = True
+
+    def apply(self):
+        # Deja el laberinto como si acabara de resolverse (llamar desde el hilo de la interfaz)
+        result = self.result
+        if self.maze.parse_time is not None:
+            result.timings["parse"] = self.maze.parse_time
+        self.maze.solution = result.solution
+        self.maze.explored = result.explored
+        self.maze.num_explored = result.num_explored
+        self.maze.metrics = result.metrics
+
+class ReplayRun():
+    # Misma interfaz que SearchRun, pero a partir de una SearchTrace (laberinto.trace) ya
+    # grabada: no se vuelve a buscar, solo se reproducen sus pasos
+    def __init__(self, maze, trace):
+        self.maze = maze
+        self.trace = trace
+        self.algorithm = trace.algorithm
+        self.steps = trace.states()
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self.done = threading.Event()
+
+    def start(self):
+        self.result = self.trace.result()
+        self.done.set()
+        return self
+
+    def cancel(self):
+        self.cancelled = True
+
+    def apply(self):
+        self.trace.apply(self.maze)
+
+class Animation():
+    # Reproduce un SearchRun sobre cualquier widget de Tk (solo usa after/after_cancel).
+    # on_frame(states) recibe los estados nuevos de cada fotograma; on_finish(run) se llama
+    # una vez, al terminar la búsqueda y haberse mostrado todos sus pasos.
+    def __init__(self, widget, run, on_frame, on_finish=None, delay=100, skip=1):
+        self.widget = widget
+        self.run = run
+        self.on_frame = on_frame
+        self.on_finish = on_finish
+        self.delay = delay  # Milisegundos entre fotogramas
+        self.skip = skip  # Expansiones por fotograma
+        self.position = 0
+        self.paused = False
+        self.finished = False
+        self.job = None
+
+    def start(self):
+        if isinstance(self.run, ReplayRun):
+            self.run.start()
+        elif not self.run.done.is_set() and not self.run.thread.is_alive():
+            self.run.start()
+        self.schedule()
+        return self
+
+    def schedule(self):
+        if not self.paused and not self.finished:
+            self.job = self.widget.after(self.delay, self.tick)
+
+    def tick(self):
+        self.job = None
+        available = len(self.run.steps)
+        if self.position < available:
+            end = min(available, self.position + max(1, self.skip))
+            states = self.run.steps[self.position:end]
+            self.position = end
+            self.on_frame(states)
+        elif self.run.done.is_set():
+            self.finish()
+            return
+        self.schedule()
+
+    def finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        if self.run.result is not None and not self.run.cancelled:
+            self.run.apply()
+        if self.on_finish is not None:
+            self.on_finish(self.run)
+
+    def set_speed(self, delay=None, skip=None):
+        if delay is not None:
+            self.delay = max(1, int(delay))
+        if skip is not None:
+            self.skip = max(1, int(skip))
+
+    def pause(self):
+        self.paused = True
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+
+    def resume(self):
+        if self.paused:
+            self.paused = False
+            self.schedule()
+
+    def cancel(self):
+        self.pause()
+        self.run.cancel()
+        self.finished = True
@@ -0,0 +1,166 @@
+import os
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+from .components import ComponentIndex
+from .grid import Grid, StateSet
+from .maze import Maze
+from .search import solve
+
+# Resolución por lotes: muchas consultas (inicio, meta, algoritmo) sobre muchos laberintos,
+# repartidas en un pool de procesos. Cada rejilla (muros y máscara de vecinos) se copia una
+# sola vez a memoria compartida y los procesos la enlazan por nombre, así que las tareas solo
+# transportan el nombre y las consultas.
+
+class BatchResult():
+    def __init__(self, maze_index, query_index, start, goal, algorithm, result=None, error=None):
+        self.maze_index = maze_index
+        self.query_index = query_index
+        self.start = start
+        self.goal = goal
+        self.algorithm = algorithm
+        self.result = result  # SolveResult, o None si la consulta falló
+        self.error = error  # Mensaje de error ("no solution", ...)
+
+    def __repr__(self):
+        outcome = self.result if self.error is None else f"error={self.error!r}"
+        return f"BatchResult(maze={self.maze_index}, query={self.query_index}, {outcome})"
+
+class SharedGrid():
+    # Muros, máscara de vecinos y, si hay terreno, costes de una rejilla en un bloque de
+    # memoria compartida. Con `index` (ComponentIndex de la rejilla) van detrás sus etiquetas y
+    # tamaños, para que los procesos no vuelvan a etiquetar el laberinto.
+    def __init__(self, grid, index=None):
+        size = grid.width * grid.height
+        self.width, self.height = grid.width, grid.height
+        self.weighted = grid.costs is not None
+        self.components = len(index.sizes) if index is not None else None  # Etiquetas enviadas
+        labels = _labels_offset(size, self.weighted)
+        total = labels + 4 * (size + self.components) if index is not None else (3 if self.weighted else 2) * size
+        self.memory = shared_memory.SharedMemory(create=True, size=max(total, 1))
+        self.memory.buf[:size] = grid.cells
+        self.memory.buf[size:2 * size] = grid.open
+        if self.weighted:
+            self.memory.buf[2 * size:3 * size] = grid.costs
+        if index is not None:
+            self.memory.buf[labels:labels + 4 * size] = index.labels.tobytes()
+            self.memory.buf[labels + 4 * size:total] = array("i", index.sizes).tobytes()
+        self.name = self.memory.name
+
+    def release(self):
+        self.memory.close()
+        self.memory.unlink()
+
+def _labels_offset(size, weighted):
+    # Las etiquetas (enteros de 4 bytes) empiezan alineadas tras los bytes de la rejilla
+    end = (3 if weighted else 2) * size
+    return (end + 3) // 4 * 4
+
+# Caché de cada proceso: nombre del bloque compartido -> (SharedMemory, Maze)
+_attached = {}
+MAX_ATTACHED = 8
+
+def _attach(name, width, height, weighted=False, components=None):
+    if name not in _attached:
+        while len(_attached) >= MAX_ATTACHED:
+            memory, maze = _attached.pop(next(iter(_attached)))  # El más antiguo
+            del maze
+            try:
+                memory.close()
+            except BufferError:
+                pass  # Aún hay vistas vivas; se libera al recogerlas
+        memory = shared_memory.SharedMemory(name=name)
+        size = width * height
+        costs = memory.buf[2 * size:3 * size] if weighted else None
+        grid = Grid(width, height, memory.buf[:size], open_mask=memory.buf[size:2 * size], costs=costs)
+        maze = Maze.from_grid(grid, None, None)
+        if components is not None:
+            labels = _labels_offset(size, weighted)
+            sizes = memory.buf[labels + 4 * size:labels + 4 * (size + components)].cast("i").tolist()
+            maze.component_index = ComponentIndex(grid, memory.buf[labels:labels + 4 * size].cast("i"), sizes)
+        _attached[name] = (memory, maze)
+    return _attached[name][1]
+
+def _solve_chunk(name, width, height, weighted, queries, keep_explored, components=None):
+    maze = _attach(name, width, height, weighted, components)
+    out = []
+    for index, start, goal, algorithm in queries:
+        try:
+            result = solve(maze, algorithm=algorithm, start=start, goal=goal)
+        except Exception as e:
+            out.append((index, None, str(e)))
+            continue
+        if not keep_explored:
+            result.explored = StateSet(width, set())  # No devolver el conjunto por la tubería
+        out.append((index, result, None))
+    return out
+
+def solve_batch(jobs, max_workers=None, chunk_size=64, keep_explored=False):
+    # jobs: iterable de (laberinto, consultas), con el laberinto como Maze o nombre de fichero y
+    # las consultas como (inicio, meta, algoritmo); inicio/meta None usan los del laberinto.
+    # Genera un BatchResult por consulta a medida que terminan (sin orden garantizado). Si un
+    # Maze ya tiene índice de componentes (Maze.components()), sus etiquetas viajan con la
+    # rejilla y las metas inalcanzables se descartan en los procesos sin buscar.
+    max_workers = max_workers or os.cpu_count() or 1
+    shared = {}  # Índice de laberinto -> [SharedGrid, tareas pendientes, todas enviadas]
+    pending = {}  # Futuro -> (índice de laberinto, consultas del bloque)
+
+    def collect(futures):
+        for future in futures:
+            maze_index, chunk = pending.pop(future)
+            queries = {query[0]: query for query in chunk}
+            for index, result, error in future.result():
+                _, start, goal, algorithm = queries[index]
+                yield BatchResult(maze_index, index, start, goal, algorithm, result, error)
+            entry = shared[maze_index]
+            entry[1] -= 1
+            if entry[1] == 0 and entry[2]:
+                entry[0].release()
+                del shared[maze_index]
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            try:
+                for maze_index, (maze, queries) in enumerate(jobs):
+                    if not isinstance(maze, Maze):
+                        maze = Maze(maze)
+                    grid = SharedGrid(maze.walls, maze.component_index)
+                    entry = shared[maze_index] = [grid, 0, False]
+
+                    chunk = []
+                    for query_index, (start, goal, algorithm) in enumerate(queries):
+                        start = maze.start if start is None else start
+                        goal = maze.goal if goal is None else goal
+                        chunk.append((query_index, start, goal, algorithm))
+                        if len(chunk) < chunk_size:
+                            continue
+                        future = pool.submit(_solve_chunk, grid.name, grid.width, grid.height, grid.weighted, chunk,
+                                             keep_explored, grid.components)
+                        pending[future] = (maze_index, chunk)
+                        entry[1] += 1
+                        chunk = []
+                        # Limitar las tareas en vuelo para no encolar el lote entero en memoria
+                        while len(pending) >= 4 * max_workers:
+                            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            yield from collect(done)
+
+                    if chunk:
+                        future = pool.submit(_solve_chunk, grid.name, grid.width, grid.height, grid.weighted, chunk,
+                                             keep_explored, grid.components)
+                        pending[future] = (maze_index, chunk)
+                        entry[1] += 1
+                    entry[2] = True
+                    if entry[1] == 0:
+                        grid.release()
+                        del shared[maze_index]
+
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from collect(done)
+            finally:
+                for future in pending:
+                    future.cancel()  # Las que ya corren terminan antes de cerrar el pool
+    finally:
+        for grid, _, _ in shared.values():
+            grid.release()
@@ -0,0 +1,155 @@
+"""Banco de pruebas de los algoritmos sobre laberintos generados de distintos tamaños y tipos.
+
+    python -m laberinto.benchmark --sizes 63 127 255 --types perfect braided rooms corridors
+    python -m laberinto.benchmark --format csv --output resultados.csv
+
+Cada fila mide un (tipo, tamaño, algoritmo): tiempo de pared, nodos expandidos, pico de
+memoria durante la búsqueda, longitud del camino y contadores de la frontera. La salida es JSON por líneas (o CSV)
+para poder comparar ejecuciones entre versiones.
+"""
+
+import argparse
+import csv
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from .generator import dfs_maze, generate_maze
+from .grid import Grid
+from .maze import Maze
+from .search import ALGORITHMS, INDEXED_ALGORITHMS, solve
+
+def open_rooms(size, seed=0, density=0.2, room=16):
+    # Salas abiertas: tabiques cada `room` celdas con una puerta por tramo y pilares sueltos.
+    # Los pilares y los tabiques solo ocupan coordenadas pares (y las puertas son impares), así
+    # que las filas y columnas impares quedan libres y el laberinto siempre tiene solución.
+    size = size | 1
+    rnd = random.Random(seed)
+    cells = bytearray(size * size)
+    for i in range(0, size, 2):
+        for j in range(0, size, 2):
+            if (i in (0, size - 1) or j in (0, size - 1) or i % room == 0 or j % room == 0
+                    or rnd.random() < density):
+                cells[i * size + j] = 1
+    for line in range(room, size - 1, room):
+        for first in range(0, size - 1, room):
+            door = first + 1 + 2 * rnd.randrange(max(1, (min(room, size - 1 - first) - 1) // 2))
+            for other in range(first + 1, min(first + room, size - 1)):
+                if other != door:
+                    cells[line * size + other] = 1  # Tabique horizontal
+                    cells[other * size + line] = 1  # Tabique vertical
+    for cell in range(size):
+        cells[cell] = cells[(size - 1) * size + cell] = 1
+        cells[cell * size] = cells[cell * size + size - 1] = 1
+    return Maze.from_grid(Grid(size, size, cells), (1, 1), (size - 2, size - 2))
+
+WORKLOADS = {
+    "perfect": lambda size, seed=0: generate_maze(size, size, seed),
+    "braided": lambda size, seed=0: generate_maze(size, size, seed, loops=0.1),
+    "rooms": open_rooms,
+    "corridors": lambda size, seed=0: dfs_maze(size, size, seed, straightness=0.8),
+}
+
+def measure(maze, algorithm, repeat=3, indexed=False):
+    # Mejor tiempo de `repeat` ejecuciones, pico de memoria en una ejecución aparte (tracemalloc
+    # ralentiza la búsqueda) y contadores de la frontera en otra, para no medirlos juntos
+    record = {"algorithm": algorithm + ("+index" if indexed else "")}
+    try:
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = solve(maze, algorithm=algorithm, indexed=indexed)
+            times.append(time.perf_counter() - started)
+        tracemalloc.start()
+        try:
+            solve(maze, algorithm=algorithm, indexed=indexed)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        counted = solve(maze, algorithm=algorithm, indexed=indexed, metrics=True).metrics
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+
+    record.update(
+        seconds=min(times),
+        nodes_expanded=result.num_explored,
+        peak_memory_bytes=peak,
+        path_length=len(result.actions),
+        pushes=counted.pushes,
+        pops=counted.pops,
+        duplicates=counted.duplicates,
+        frontier_peak=counted.frontier_peak,
+    )
+    return record
+
+def environment():
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+    try:
+        info["commit"] = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                        text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    return info
+
+def run(sizes, types, algorithms, repeat=3, seed=0, indexed=False):
+    # Genera un registro (dict) por cada combinación
+    env = environment()
+    for kind in types:
+        for size in sizes:
+            build_start = time.perf_counter()
+            maze = WORKLOADS[kind](size, seed=seed)
+            build = time.perf_counter() - build_start
+            index_start = time.perf_counter()
+            maze.components()  # Índice de componentes: una vez por laberinto, fuera de `seconds`
+            index = time.perf_counter() - index_start
+            for algorithm in algorithms:
+                variants = [False, True] if indexed and algorithm in INDEXED_ALGORITHMS else [False]
+                for use_index in variants:
+                    record = {"type": kind, "size": size, "width": maze.width, "height": maze.height,
+                              "seed": seed, "build_seconds": build, "index_seconds": index}
+                    record.update(measure(maze, algorithm, repeat, use_index))
+                    record.update(env)
+                    yield record
+
+FIELDS = ("type", "size", "width", "height", "seed", "algorithm", "seconds", "nodes_expanded",
+          "peak_memory_bytes", "path_length", "pushes", "pops", "duplicates", "frontier_peak",
+          "build_seconds", "index_seconds", "error", "python", "platform", "timestamp", "commit")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banco de pruebas de los algoritmos de búsqueda")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[31, 63, 127])
+    parser.add_argument("--types", nargs="+", choices=sorted(WORKLOADS), default=sorted(WORKLOADS))
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--indexed", action="store_true", help="medir también con el índice de corredores")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--output", help="fichero de salida (por defecto, la salida estándar)")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(out, FIELDS) if args.format == "csv" else None
+        if writer:
+            writer.writeheader()
+        for record in run(args.sizes, args.types, args.algorithms, args.repeat, args.seed, args.indexed):
+            if writer:
+                writer.writerow(record)
+            else:
+                out.write(json.dumps(record) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == "__main__":
+    main()
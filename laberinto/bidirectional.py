@@ -0,0 +1,129 @@
+import heapq
+import time
+
+_OPPOSITE = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+def join_paths(width, forward, backward, meet):
+    # forward: celda -> (celda anterior, acción desde ella); backward: celda -> (celda
+    # siguiente hacia la meta, acción hacia ella). Devuelve (acciones, ids de celda).
+    actions = []
+    cells = []
+    cell = meet
+    while cell in forward:
+        previous, action = forward[cell]
+        actions.append(action)
+        cells.append(cell)
+        cell = previous
+    actions.reverse()
+    cells.reverse()
+
+    cell = meet
+    while cell in backward:
+        cell, action = backward[cell]
+        actions.append(action)
+        cells.append(cell)
+    return actions, cells
+
+def _finish(grid, forward, backward, meet, explored, num_explored, timings):
+    path_start = time.perf_counter()
+    actions, cells = join_paths(grid.width, forward, backward, meet)
+    if timings is not None:
+        timings["path"] = time.perf_counter() - path_start
+    return actions, [divmod(cell, grid.width) for cell in cells], explored, num_explored
+
+def bidirectional_bfs(maze, start, goal, step_callback=None, timings=None):
+    grid = maze.walls
+    width, offsets, open_mask = grid.width, grid.offsets, grid.open
+    start, goal = grid.cell(start), grid.cell(goal)
+
+    # Distancias y padres de cada lado; se expande siempre un nivel completo del lado con la
+    # frontera más pequeña y se elige el mejor punto de encuentro de ese nivel
+    dist = ({start: 0}, {goal: 0})
+    parents = ({}, {})
+    layers = ([start], [goal])
+    explored = set()
+    num_explored = 0
+
+    if start == goal:
+        return _finish(grid, parents[0], parents[1], start, explored, 1, timings)
+
+    while layers[0] and layers[1]:
+        side = 0 if len(layers[0]) <= len(layers[1]) else 1
+        mine, other = dist[side], dist[1 - side]
+        parent = parents[side]
+        best = None
+        next_layer = []
+        for cell in layers[side]:
+            num_explored += 1
+            if step_callback:
+                step_callback(divmod(cell, width))
+            explored.add(cell)
+            for action, delta in offsets[open_mask[cell]]:
+                neighbor = cell + delta
+                if neighbor in mine:
+                    continue
+                mine[neighbor] = mine[cell] + 1
+                # Hacia delante se guarda el padre; hacia atrás, el siguiente paso hacia la meta
+                parent[neighbor] = (cell, action) if side == 0 else (cell, _OPPOSITE[action])
+                next_layer.append(neighbor)
+                if neighbor in other:
+                    total = mine[neighbor] + other[neighbor]
+                    if best is None or total < best[0]:
+                        best = (total, neighbor)
+        if best is not None:
+            return _finish(grid, parents[0], parents[1], best[1], explored, num_explored, timings)
+        layers = (next_layer, layers[1]) if side == 0 else (layers[0], next_layer)
+
+    raise Exception("no solution")
+
+def bidirectional_astar(maze, start, goal, step_callback=None, timings=None):
+    grid = maze.walls
+    width, offsets, open_mask = grid.width, grid.offsets, grid.open
+    start, goal = grid.cell(start), grid.cell(goal)
+
+    def manhattan_to(target):
+        target_row, target_col = divmod(target, width)
+
+        def heuristic(cell):
+            row, col = divmod(cell, width)
+            return abs(row - target_row) + abs(col - target_col)
+        return heuristic
+
+    heuristics = (manhattan_to(goal), manhattan_to(start))
+    g = ({start: 0}, {goal: 0})
+    parents = ({}, {})
+    heaps = ([(heuristics[0](start), start)], [(heuristics[1](goal), goal)])
+    closed = (set(), set())
+    best_cost, meet = (0, start) if start == goal else (None, None)
+    num_explored = 0
+
+    while heaps[0] and heaps[1]:
+        # Criterio de parada (Pohl): con heurísticas consistentes ningún camino puede costar
+        # menos que el menor f de cualquiera de las dos fronteras
+        if best_cost is not None and max(heaps[0][0][0], heaps[1][0][0]) >= best_cost:
+            break
+
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        heap, mine, other = heaps[side], g[side], g[1 - side]
+        priority, cell = heapq.heappop(heap)
+        if cell in closed[side] or priority > mine[cell] + heuristics[side](cell):
+            continue  # Entrada obsoleta (borrado perezoso)
+        closed[side].add(cell)
+        num_explored += 1
+        if step_callback:
+            step_callback(divmod(cell, width))
+
+        for action, delta in offsets[open_mask[cell]]:
+            neighbor = cell + delta
+            cost = mine[cell] + 1
+            if cost < mine.get(neighbor, cost + 1):
+                mine[neighbor] = cost
+                parents[side][neighbor] = (cell, action) if side == 0 else (cell, _OPPOSITE[action])
+                heapq.heappush(heap, (cost + heuristics[side](neighbor), neighbor))
+                if neighbor in other and (best_cost is None or cost + other[neighbor] < best_cost):
+                    best_cost, meet = cost + other[neighbor], neighbor
+
+    if meet is None:
+        raise Exception("no solution")
+    explored = closed[0] | closed[1]
+    return _finish(grid, parents[0], parents[1], meet, explored, max(num_explored, 1), timings)
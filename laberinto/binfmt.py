@@ -0,0 +1,116 @@
+"""Formato binario de laberintos y conversor desde los ficheros de texto.
+
+Cabecera little-endian: magic b"LAB\\x01", ancho, alto, fila/columna de inicio y fila/columna
+de meta (uint64), seguida de los muros empaquetados a 1 bit por celda, fila a fila, con el
+bit más significativo primero. Los laberintos con terreno ponderado usan el magic b"LAB\\x02"
+y añaden detrás el coste de cada celda (un byte por celda).
+
+    python -m laberinto.binfmt laberinto5.txt            # escribe laberinto5.lab
+"""
+
+import argparse
+import mmap
+import os
+import struct
+
+from .grid import Grid
+
+MAGIC = b"LAB\x01"
+WEIGHTED_MAGIC = b"LAB\x02"
+HEADER = struct.Struct("<4s6Q")
+CHUNK = 1 << 20  # Bytes empaquetados por bloque, para acotar la memoria temporal
+
+_TO_ASCII = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_ASCII = bytes.maketrans(b"01", b"\x00\x01")
+
+def pack_cells(cells):
+    # Rejilla de bytes 0/1 -> bits, por bloques (int(..., 2) es lineal en base 2)
+    out = bytearray()
+    step = CHUNK * 8
+    for offset in range(0, len(cells), step):
+        bits = bytes(cells[offset:offset + step]).translate(_TO_ASCII)
+        bits += b"0" * (-len(bits) % 8)
+        out += int(bits, 2).to_bytes(len(bits) // 8, "big")
+    return out
+
+def unpack_cells(packed, size):
+    # Bits -> rejilla de bytes 0/1 de `size` celdas
+    cells = bytearray(size)
+    for offset in range(0, len(packed), CHUNK):
+        chunk = packed[offset:offset + CHUNK]
+        bits = format(int.from_bytes(chunk, "big"), "b").zfill(len(chunk) * 8)
+        bits = bits.encode("ascii").translate(_FROM_ASCII)
+        start = offset * 8
+        cells[start:start + len(bits)] = bits[:size - start]
+    return cells
+
+def is_binary(filename):
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) in (MAGIC, WEIGHTED_MAGIC)
+
+def write_binary(filename, grid, start, goal):
+    magic = MAGIC if grid.costs is None else WEIGHTED_MAGIC
+    with open(filename, "wb") as f:
+        f.write(HEADER.pack(magic, grid.width, grid.height, *start, *goal))
+        f.write(pack_cells(grid.cells))
+        if grid.costs is not None:
+            f.write(grid.costs)
+
+def write_rows(filename, width, height, start, goal, rows):
+    # Como write_binary, pero a partir de filas sueltas (p. ej. de laberinto.generator): solo
+    # se guarda en memoria un bloque de bits pendiente, no la rejilla entera
+    step = CHUNK * 8
+    with open(filename, "wb") as f:
+        f.write(HEADER.pack(MAGIC, width, height, *start, *goal))
+        pending = bytearray()
+        for row in rows:
+            pending += row
+            if len(pending) >= step:
+                f.write(pack_cells(pending[:step]))
+                del pending[:step]
+        f.write(pack_cells(pending))
+
+def load_binary(filename):
+    # Mapea el fichero en memoria y desempaqueta los muros directamente desde el mapa,
+    # sin leerlo ni copiarlo antes. Devuelve (grid, start, goal).
+    with open(filename, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, width, height, start_row, start_col, goal_row, goal_col = HEADER.unpack_from(mm)
+        if magic not in (MAGIC, WEIGHTED_MAGIC):
+            raise Exception(f"{filename} no es un laberinto binario")
+        size = width * height
+        nbytes = (size + 7) // 8
+        weighted = magic == WEIGHTED_MAGIC
+        if len(mm) < HEADER.size + nbytes + (size if weighted else 0):
+            raise Exception(f"{filename} está truncado")
+        view = memoryview(mm)[HEADER.size:HEADER.size + nbytes]
+        try:
+            cells = unpack_cells(view, size)
+        finally:
+            view.release()
+        costs = None
+        if weighted:
+            offset = HEADER.size + nbytes
+            costs = bytearray(mm[offset:offset + size])
+    return Grid(width, height, cells, costs=costs), (start_row, start_col), (goal_row, goal_col)
+
+def convert(source, target=None):
+    from .maze import load_grid
+
+    if target is None:
+        target = os.path.splitext(source)[0] + ".lab"
+    grid, start, goal = load_grid(source)
+    write_binary(target, grid, start, goal)
+    return target
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convierte laberintos de texto al formato binario")
+    parser.add_argument("files", nargs="+", help="ficheros laberintoN.txt")
+    parser.add_argument("-o", "--output", help="fichero de salida (solo con una entrada)")
+    args = parser.parse_args(argv)
+    if args.output and len(args.files) > 1:
+        parser.error("--output solo admite un fichero de entrada")
+    for source in args.files:
+        print(f"{source} -> {convert(source, args.output)}")
+
+if __name__ == "__main__":
+    main()
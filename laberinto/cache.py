@@ -0,0 +1,149 @@
+import hashlib
+import os
+import struct
+from array import array
+from collections import OrderedDict
+
+from .trace import SearchTrace
+
+# Caché de soluciones: la SearchTrace (laberinto.trace) de cada búsqueda, con la clave hash
+# del contenido de la rejilla + (inicio, meta, algoritmo). Tiene dos niveles: un LRU en memoria
+# con un número máximo de entradas y, opcionalmente, un directorio en disco cuyo tamaño total
+# se limita borrando los ficheros usados hace más tiempo. Como la clave es el contenido y no el
+# nombre del fichero, editar un laberinto invalida sus soluciones.
+
+def grid_hash(grid):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(struct.pack("<2Q?", grid.width, grid.height, grid.costs is not None))
+    digest.update(grid.cells)
+    if grid.costs is not None:
+        digest.update(grid.costs)
+    return digest.hexdigest()
+
+def maze_hash(maze):
+    # Hash de la rejilla de `maze`, calculado una sola vez por laberinto
+    if maze.grid_hash is None:
+        maze.grid_hash = grid_hash(maze.walls)
+    return maze.grid_hash
+
+class SolutionCache():
+    def __init__(self, directory=None, max_entries=128, max_bytes=64 << 20):
+        self.memory = OrderedDict()  # Clave -> SearchTrace, de la menos a la más usada
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_bytes = max_bytes  # Tamaño máximo del directorio en disco
+        self.hits = self.misses = 0
+        self.disk_bytes = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self.disk_bytes = sum(size for _, size, _ in self.disk_entries())
+
+    def key(self, maze, algorithm, indexed=False):
+        grid = maze.walls
+        text = (f"{maze_hash(maze)}:{grid.cell(maze.start)}:{grid.cell(maze.goal)}:{algorithm}:"
+                f"{int(indexed)}")
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".ltr")
+
+    def get(self, maze, algorithm, indexed=False):
+        key = self.key(maze, algorithm, indexed)
+        trace = self.memory.get(key)
+        if trace is not None:
+            self.memory.move_to_end(key)
+        elif self.directory is not None:
+            trace = self.load(key, maze)
+            if trace is not None:
+                self.remember(key, trace)
+        if trace is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return trace
+
+    def load(self, key, maze):
+        path = self.path(key)
+        try:
+            trace = SearchTrace.load(path)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self.discard(path)  # Fichero dañado o de otra versión
+            return None
+        if (trace.width, trace.height) != (maze.width, maze.height):
+            return None
+        os.utime(path)  # La fecha de modificación marca el último uso, para el desalojo
+        return trace
+
+    def put(self, maze, trace, indexed=False):
+        key = self.key(maze, trace.algorithm, indexed)
+        self.remember(key, trace)
+        if self.directory is not None:
+            path = self.path(key)
+            data = trace.to_bytes()
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as f:
+                f.write(data)
+            os.replace(temporary, path)  # Otros procesos nunca ven un fichero a medias
+            self.disk_bytes += len(data) - previous
+            if self.disk_bytes > self.max_bytes:
+                self.evict()
+
+    def remember(self, key, trace):
+        self.memory[key] = trace
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def disk_entries(self):
+        # (ruta, tamaño, último uso) de los ficheros del directorio
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".ltr"):
+                    stat = entry.stat()
+                    entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def evict(self):
+        # Borra los ficheros usados hace más tiempo hasta quedar por debajo de max_bytes
+        entries = sorted(self.disk_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self.discard(path)
+            total -= size
+        self.disk_bytes = total
+
+    def discard(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def solve(self, maze, algorithm="BFS", indexed=False, **options):
+        # Como maze.solve, pero devolviendo la solución guardada si la hay. Se guardan también
+        # los pasos, porque la misma entrada sirve para reproducir la búsqueda en la interfaz.
+        trace = self.get(maze, algorithm, indexed)
+        if trace is not None:
+            return trace.apply(maze)
+        steps = array("Q")
+        width = maze.width
+        result = maze.solve(step_callback=lambda state: steps.append(state[0] * width + state[1]),
+                            algorithm=algorithm, indexed=indexed, **options)
+        self.put(maze, SearchTrace.from_result(maze, result, steps), indexed)
+        return result
+
+    def clear(self):
+        self.memory.clear()
+        if self.directory is not None:
+            for path, _, _ in self.disk_entries():
+                self.discard(path)
+            self.disk_bytes = 0
+
+    def __repr__(self):
+        return (f"SolutionCache({len(self.memory)} en memoria, {self.disk_bytes} bytes en disco, "
+                f"{self.hits} aciertos, {self.misses} fallos)")
@@ -0,0 +1,245 @@
+import re
+from array import array
+from collections import deque
+
+from .grid import DOWN, RIGHT
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Sin NumPy se etiqueta por tramos en Python puro
+
+# Índice de componentes conexas: una etiqueta por celda libre (-1 en los muros) tal que dos
+# celdas se comunican si y solo si tienen la misma etiqueta. Se construye en una pasada por
+# tramos de celdas libres de cada fila, uniendo con union-find los tramos que se tocan con la
+# fila anterior, y se mantiene al día al poner o quitar muros: quitar uno puede fundir
+# componentes (se reetiquetan las menores) y poner uno puede partir la suya (se recorren las
+# partes a la vez y se reetiquetan las que se cierran antes, que son las pequeñas). Con NumPy,
+# la construcción enlaza raíces y comprime caminos sobre todas las aristas a la vez.
+
+_FREE_RUN = re.compile(b"\x00+")
+
+def label_components(grid):
+    # Devuelve (etiquetas por celda, tamaño de cada etiqueta)
+    if np is not None:
+        return label_components_numpy(grid)
+    width = grid.width
+    cells = bytes(grid.cells)
+    parent = []  # Union-find sobre los tramos
+    runs = []  # Tramo -> (inicio, fin) en ids de celda
+    previous = []  # Tramos de la fila anterior: (columna inicial, columna final, tramo)
+
+    def find(run):
+        while parent[run] != run:
+            parent[run] = parent[parent[run]]
+            run = parent[run]
+        return run
+
+    for row in range(grid.height):
+        offset = row * width
+        current = []
+        i = 0
+        for match in _FREE_RUN.finditer(cells, offset, offset + width):
+            start, end = match.start() - offset, match.end() - offset
+            run = len(parent)
+            parent.append(run)
+            runs.append((match.start(), match.end()))
+            current.append((start, end, run))
+            # Tramos de la fila anterior que se solapan con este (los dos están ordenados)
+            while i < len(previous) and previous[i][1] <= start:
+                i += 1
+            j = i
+            while j < len(previous) and previous[j][0] < end:
+                a, b = find(previous[j][2]), find(run)
+                if a != b:
+                    parent[b] = a
+                j += 1
+        previous = current
+
+    labels = array("i", [-1]) * (width * grid.height)
+    sizes = []
+    compact = {}  # Raíz -> etiqueta
+    for run, (start, end) in enumerate(runs):
+        root = find(run)
+        label = compact.get(root)
+        if label is None:
+            label = compact[root] = len(sizes)
+            sizes.append(0)
+        labels[start:end] = array("i", [label]) * (end - start)
+        sizes[label] += end - start
+    return labels, sizes
+
+def label_components_numpy(grid):
+    # Cada ronda cuelga la raíz mayor de cada arista de la menor y después salta punteros hasta
+    # que todo árbol es una estrella; en laberintos bastan unas pocas rondas
+    width, size = grid.width, grid.width * grid.height
+    free = np.frombuffer(grid.cells, dtype=np.uint8) == 0
+    open_mask = np.frombuffer(grid.open, dtype=np.uint8)
+    right = np.flatnonzero(free & ((open_mask & RIGHT) != 0))
+    down = np.flatnonzero(free & ((open_mask & DOWN) != 0))
+    u = np.concatenate([right, down])
+    v = np.concatenate([right + 1, down + width])
+    parent = np.arange(size, dtype=np.int64)
+    while True:
+        pu, pv = parent[u], parent[v]
+        pending = pu != pv
+        if not pending.any():
+            break
+        u, v, pu, pv = u[pending], v[pending], pu[pending], pv[pending]
+        np.minimum.at(parent, np.maximum(pu, pv), np.minimum(pu, pv))
+        while True:
+            jumped = parent[parent]
+            if (jumped == parent).all():
+                break
+            parent = jumped
+
+    labels = np.full(size, -1, dtype=np.int32)
+    _, labels[free] = np.unique(parent[free], return_inverse=True)
+    result = array("i")
+    result.frombytes(labels.tobytes())
+    return result, np.bincount(labels[free]).tolist()
+
+class ComponentIndex():
+    def __init__(self, grid, labels=None, sizes=None):
+        # Con `labels` y `sizes` (de otro índice de la misma rejilla) no se vuelve a etiquetar
+        self.grid = grid
+        if labels is None:
+            labels, sizes = label_components(grid)
+        self.labels, self.sizes = labels, sizes
+
+    def connected(self, a, b):
+        label = self.labels[a]
+        return label >= 0 and label == self.labels[b]
+
+    def reachable(self, start, goal):
+        # Falso solo si no hay camino de `start` a `goal` (ids de celda). Un inicio en un muro
+        # se admite, como en los motores de búsqueda: se sale de él por sus vecinas libres.
+        if start == goal:
+            return True
+        target = self.labels[goal]
+        if target < 0:
+            return False
+        if self.labels[start] >= 0:
+            return self.labels[start] == target
+        grid = self.grid
+        return any(self.labels[start + delta] == target for _, delta in grid.offsets[grid.open[start]])
+
+    def size(self, cell):
+        label = self.labels[cell]
+        return self.sizes[label] if label >= 0 else 0
+
+    def wall_changed(self, cell):
+        # Llamado por Maze.set_wall después de cambiar la rejilla. La máscara de `cell` indica
+        # sus vecinas libres en los dos casos.
+        grid, labels = self.grid, self.labels
+        neighbors = [cell + delta for _, delta in grid.offsets[grid.open[cell]]]
+        if grid.cells[cell]:
+            label = labels[cell]
+            if label < 0:
+                return
+            labels[cell] = -1
+            self.sizes[label] -= 1
+            if len(neighbors) > 1:
+                self.split(neighbors, label)
+        else:
+            if labels[cell] >= 0:
+                return
+            touching = {labels[neighbor] for neighbor in neighbors}
+            if not touching:
+                label = self.new_label()
+            else:
+                label = max(touching, key=lambda label: self.sizes[label])
+                for neighbor in neighbors:
+                    other = labels[neighbor]
+                    if other != label:
+                        self.sizes[label] += self.relabel(neighbor, other, label)
+                        self.sizes[other] = 0
+            labels[cell] = label
+            self.sizes[label] += 1
+
+    def new_label(self):
+        self.sizes.append(0)
+        return len(self.sizes) - 1
+
+    def relabel(self, cell, old, new):
+        # Cambia `old` por `new` en la parte conexa de `cell`; devuelve cuántas celdas cambió
+        grid, labels = self.grid, self.labels
+        offsets, open_mask = grid.offsets, grid.open
+        labels[cell] = new
+        queue = deque([cell])
+        count = 0
+        while queue:
+            cell = queue.popleft()
+            count += 1
+            for _, delta in offsets[open_mask[cell]]:
+                neighbor = cell + delta
+                if labels[neighbor] == old:
+                    labels[neighbor] = new
+                    queue.append(neighbor)
+        return count
+
+    def split(self, neighbors, label):
+        # Tras poner un muro: recorre a la vez la parte de cada vecina libre. Las que se
+        # encuentran forman un grupo; un grupo que se agota sin encontrar a los demás es una
+        # componente nueva. Se para en cuanto solo queda un grupo abierto, así que el coste es
+        # el de las partes pequeñas y no el de la componente entera.
+        grid, labels = self.grid, self.labels
+        offsets, open_mask = grid.offsets, grid.open
+        group = list(range(len(neighbors)))  # Búsqueda -> grupo (union-find de hasta 4)
+        owner = {}  # Celda -> búsqueda que la alcanzó
+        queues = []
+        for search, neighbor in enumerate(neighbors):
+            owner[neighbor] = search
+            queues.append(deque([neighbor]))
+
+        def find(search):
+            while group[search] != search:
+                search = group[search]
+            return search
+
+        def open_groups():
+            return {find(search) for search, queue in enumerate(queues) if queue}
+
+        while True:
+            groups = open_groups()
+            if len({find(search) for search in range(len(neighbors))}) == 1:
+                return  # Todas las vecinas siguen comunicadas
+            if len(groups) <= 1:
+                break
+            for search, queue in enumerate(queues):
+                if not queue:
+                    continue
+                cell = queue.popleft()
+                for _, delta in offsets[open_mask[cell]]:
+                    neighbor = cell + delta
+                    if labels[neighbor] != label:
+                        continue
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = search
+                        queue.append(neighbor)
+                    else:
+                        a, b = find(other), find(search)
+                        if a != b:
+                            group[b] = a
+
+        # Los grupos ya agotados son componentes nuevas; el que sigue abierto (o el último, si
+        # se agotaron todos) conserva la etiqueta
+        keep = groups.pop() if groups else find(len(neighbors) - 1)
+        parts = {}
+        for cell, search in owner.items():
+            root = find(search)
+            if root != keep:
+                parts.setdefault(root, []).append(cell)
+        for cells in parts.values():
+            new = self.new_label()
+            for cell in cells:
+                labels[cell] = new
+            self.sizes[new] = len(cells)
+            self.sizes[label] -= len(cells)
+
+    def __len__(self):
+        return sum(1 for size in self.sizes if size)
+
+    def __repr__(self):
+        return f"ComponentIndex({len(self)} componentes)"
@@ -0,0 +1,165 @@
+import heapq
+import time
+from array import array
+
+# Índice de corredores: el laberinto comprimido en un grafo ponderado cuyos nodos son los
+# cruces, esquinas sin salida y extremos (celdas libres con un número de vecinos distinto de
+# 2) y cuyas aristas son los corredores de celdas de grado 2 que los unen, con su longitud.
+
+_DEGREE = bytes(bin(mask).count("1") for mask in range(16))
+
+class CorridorGraph():
+    def __init__(self, grid):
+        self.grid = grid
+        size = grid.width * grid.height
+        cells, open_mask, offsets = grid.cells, grid.open, grid.offsets
+
+        self.edges = {}  # Nodo -> [(vecino, longitud, índice de corredor, sentido directo)]
+        self.corridors = []  # Índice -> (nodo a, nodo b, celdas interiores de a hacia b)
+        self.corridor_of = array("i", [-1]) * size  # Celda interior -> índice de corredor
+        self.position = array("i", [0]) * size  # Celda interior -> posición en su corredor
+
+        for cell in range(size):
+            if not cells[cell] and _DEGREE[open_mask[cell]] != 2:
+                self.edges[cell] = []
+
+        for node in self.edges:
+            for _, delta in offsets[open_mask[node]]:
+                previous, cell = node, node + delta
+                if self.corridor_of[cell] >= 0:
+                    continue  # Corredor ya recorrido desde su otro extremo
+                interior = []
+                while cell not in self.edges:
+                    interior.append(cell)
+                    for _, step in offsets[open_mask[cell]]:
+                        if cell + step != previous:
+                            previous, cell = cell, cell + step
+                            break
+                if not interior and cell < node:
+                    continue  # Nodos adyacentes: la arista se añade desde el menor
+                self.add_corridor(node, cell, interior)
+
+    def add_corridor(self, a, b, interior):
+        index = len(self.corridors)
+        self.corridors.append((a, b, interior))
+        for position, cell in enumerate(interior):
+            self.corridor_of[cell] = index
+            self.position[cell] = position
+        length = len(interior) + 1
+        self.edges[a].append((b, length, index, True))
+        self.edges[b].append((a, length, index, False))
+
+    def edge_cells(self, index, forward):
+        # Celdas recorridas por una arista, sin el nodo de salida y con el de llegada
+        a, b, interior = self.corridors[index]
+        return interior + [b] if forward else interior[::-1] + [a]
+
+    def attach(self, cell):
+        # Conexiones de una celda cualquiera con los nodos del grafo: [(nodo, longitud, celdas)]
+        if cell in self.edges:
+            return [(cell, 0, [])]
+        index = self.corridor_of[cell]
+        if index < 0:
+            return None  # Ciclo cerrado sin cruces: no está en el grafo
+        a, b, interior = self.corridors[index]
+        position = self.position[cell]
+        return [
+            (a, position + 1, interior[position - 1::-1] + [a] if position else [a]),
+            (b, len(interior) - position, interior[position + 1:] + [b]),
+        ]
+
+    def __repr__(self):
+        return f"CorridorGraph({len(self.edges)} nodos, {len(self.corridors)} corredores)"
+
+def corridor_search(strategy, maze, start, goal, step_callback=None, timings=None):
+    # Búsqueda sobre el índice de corredores de `maze` con la estrategia de BFS (coste uniforme
+    # sobre las longitudes), DFS, Greedy o A*; el camino se expande a celdas al terminar
+    from .flat import flat_search
+
+    graph = maze.corridors()
+    grid = maze.walls
+    width = grid.width
+    start, goal = grid.cell(start), grid.cell(goal)
+    from_start, to_goal = graph.attach(start), graph.attach(goal)
+    if from_start is None or to_goal is None:
+        # Inicio o meta en un ciclo aislado: buscar celda a celda
+        return flat_search("A*", maze, divmod(start, width), divmod(goal, width),
+                           step_callback=step_callback, timings=timings)
+
+    # Aristas temporales del inicio y hacia la meta: (vecino, longitud, None, celdas)
+    extra = {start: [(node, length, None, path) for node, length, path in from_start if node != start]}
+    for node, length, path in to_goal:
+        if node != goal:
+            back = path[-2::-1] + [goal]  # De `node` hasta la meta
+            extra.setdefault(node, []).append((goal, length, None, back))
+    if start not in graph.edges and graph.corridor_of[start] == graph.corridor_of[goal] and start != goal:
+        # Inicio y meta en el mismo corredor: tramo directo
+        index = graph.corridor_of[start]
+        interior = graph.corridors[index][2]
+        i, j = graph.position[start], graph.position[goal]
+        direct = interior[i + 1:j + 1] if i < j else interior[j:i][::-1]
+        extra[start].append((goal, abs(i - j), None, direct))
+
+    goal_row, goal_col = divmod(goal, width)
+
+    def heuristic(cell):
+        row, col = divmod(cell, width)
+        return abs(row - goal_row) + abs(col - goal_col)
+
+    keys = {
+        "BFS": lambda cost, cell, order: cost,
+        "A*": lambda cost, cell, order: cost + heuristic(cell),
+        "Greedy": lambda cost, cell, order: heuristic(cell),
+        "DFS": lambda cost, cell, order: -order,
+    }
+    key = keys[strategy]
+    optimal = strategy in ("BFS", "A*")
+
+    g = {start: 0}
+    parents = {}  # Nodo -> (nodo anterior, índice de corredor o None, sentido o celdas)
+    heap = [(key(0, start, 0), 0, start)]
+    explored = set()
+    num_explored = order = 0
+
+    while heap:
+        _, _, node = heapq.heappop(heap)
+        if node in explored:
+            continue  # Entrada obsoleta (borrado perezoso)
+        num_explored += 1
+        if step_callback:
+            step_callback(divmod(node, width))
+
+        if node == goal:
+            path_start = time.perf_counter()
+            cells = []
+            while node in parents:
+                previous, index, detail = parents[node]
+                cells.extend(reversed(detail if index is None else graph.edge_cells(index, detail)))
+                node = previous
+            cells.reverse()
+            actions = cell_actions(width, start, cells)
+            if timings is not None:
+                timings["path"] = time.perf_counter() - path_start
+            return actions, [divmod(cell, width) for cell in cells], explored, num_explored
+
+        explored.add(node)
+        for neighbor, length, index, detail in graph.edges.get(node, []) + extra.get(node, []):
+            if neighbor in explored:
+                continue
+            cost = g[node] + length
+            if neighbor not in g or (optimal and cost < g[neighbor]):
+                g[neighbor] = cost
+                parents[neighbor] = (node, index, detail)
+                order += 1
+                heapq.heappush(heap, (key(cost, neighbor, order), order, neighbor))
+
+    raise Exception("no solution")
+
+def cell_actions(width, start, cells):
+    names = {-1: "left", 1: "right", -width: "up", width: "down"}  # Con ancho 1, ±1 es vertical
+    actions = []
+    previous = start
+    for cell in cells:
+        actions.append(names[cell - previous])
+        previous = cell
+    return actions
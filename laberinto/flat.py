@@ -0,0 +1,169 @@
+import heapq
+import time
+from array import array
+from collections import deque
+
+# Núcleo de búsqueda sin objetos Node: padre, acción y coste de cada celda viven en arrays
+# planos indexados por id de celda (fila * ancho + columna), reservados una vez por búsqueda,
+# y las colas guardan solo enteros (ids, o tuplas (prioridad, coste, orden, id) en el heap).
+# Expande las celdas en el mismo orden que QueueFrontier, StackFrontier y DijkstraFrontier; en
+# Greedy y A* los empates de prioridad y coste se deciden por orden de inserción, en vez de
+# dejarlos a la forma del heap como hacen las tuplas (prioridad, Node) de GreedyFrontier.
+
+ACTIONS = ("up", "down", "left", "right")
+_ACTION_INDEX = {action: index for index, action in enumerate(ACTIONS)}
+
+NEW, QUEUED, EXPLORED = 0, 1, 2  # Estado de cada celda durante la búsqueda
+
+def flat_search(strategy, maze, start, goal, step_callback=None, timings=None, metrics=None):
+    # Motor con la interfaz de ALGORITHMS para "BFS", "DFS", "Greedy", "A*" y "Dijkstra". Con
+    # `metrics` (SearchMetrics) cuenta además inserciones, extracciones, duplicados y el tamaño
+    # máximo de la cola (en el heap y las cubetas, con las entradas obsoletas, como las fronteras)
+    grid = maze.walls
+    width = grid.width
+    size = width * grid.height
+    costs, open_mask = grid.costs, grid.open
+    start, goal = grid.cell(start), grid.cell(goal)
+    goal_row, goal_col = divmod(goal, width)
+
+    # Tabla máscara -> ((índice de acción, desplazamiento), ...), en el orden de Grid.offsets
+    moves = tuple(tuple((_ACTION_INDEX[action], delta) for action, delta in offsets) for offsets in grid.offsets)
+
+    parent = array("i", [-1]) * size
+    action = array("b", [-1]) * size
+    cost = array("i", [0]) * size
+    status = bytearray(size)
+    explored = set()
+    num_explored = 0
+    if metrics is not None:
+        metrics.start_counting()
+        metrics.pushes = metrics.frontier_peak = 1  # El inicio
+
+    if strategy in ("BFS", "DFS"):
+        frontier = deque([start]) if strategy == "BFS" else [start]
+        remove = frontier.popleft if strategy == "BFS" else frontier.pop
+        status[start] = QUEUED
+        while frontier:
+            cell = remove()
+            num_explored += 1
+            if metrics is not None:
+                metrics.pops += 1
+            if step_callback:
+                step_callback(divmod(cell, width))
+            if cell == goal:
+                return path(width, parent, action, start, goal, explored, num_explored, timings)
+            status[cell] = EXPLORED
+            explored.add(cell)
+            step = cost[cell] + 1
+            for index, delta in moves[open_mask[cell]]:
+                neighbor = cell + delta
+                if status[neighbor] == NEW:
+                    status[neighbor] = QUEUED
+                    parent[neighbor] = cell
+                    action[neighbor] = index
+                    cost[neighbor] = step if costs is None else cost[cell] + costs[neighbor]
+                    frontier.append(neighbor)
+                    if metrics is not None:
+                        metrics.pushes += 1
+                        metrics.frontier_peak = max(metrics.frontier_peak, len(frontier))
+                elif metrics is not None and status[neighbor] == QUEUED:
+                    metrics.duplicates += 1
+        raise Exception("no solution")
+
+    if strategy not in ("Greedy", "A*", "Dijkstra"):
+        raise ValueError(f"Estrategia desconocida: {strategy!r}")
+
+    # Prioridad vigente de cada celda en la frontera: las entradas con otra prioridad, o de
+    # celdas ya exploradas, son obsoletas (borrado perezoso, como en GreedyFrontier)
+    priority = array("i", [0]) * size
+    greedy, weighted_only = strategy == "Greedy", strategy == "Dijkstra"
+
+    def key(cell, g):
+        if weighted_only:
+            return g
+        row, col = divmod(cell, width)
+        h = abs(row - goal_row) + abs(col - goal_col)
+        return h if greedy else g + h
+
+    if weighted_only:
+        # Cubetas de Dial (como BucketFrontier): prioridad -> pila de ids
+        buckets = {0: [start]}
+        current = 0
+    else:
+        heap = [(key(start, 0), 0, 0, start)]
+        order = 0
+    pending = 1  # Entradas en la cola, incluidas las obsoletas
+    priority[start] = key(start, 0)
+    status[start] = QUEUED
+
+    while pending:
+        if weighted_only:
+            bucket = buckets.get(current)
+            if not bucket:
+                buckets.pop(current, None)
+                current += 1
+                continue
+            cell = bucket.pop()
+            pending -= 1
+            if status[cell] != QUEUED or priority[cell] != current:
+                continue  # Entrada obsoleta
+        else:
+            p, _, _, cell = heapq.heappop(heap)
+            pending -= 1
+            if status[cell] != QUEUED or priority[cell] != p:
+                continue
+
+        num_explored += 1
+        if metrics is not None:
+            metrics.pops += 1
+        if step_callback:
+            step_callback(divmod(cell, width))
+        if cell == goal:
+            return path(width, parent, action, start, goal, explored, num_explored, timings)
+        status[cell] = EXPLORED
+        explored.add(cell)
+
+        g_cell = cost[cell]
+        for index, delta in moves[open_mask[cell]]:
+            neighbor = cell + delta
+            state = status[neighbor]
+            if state == EXPLORED:
+                continue
+            if metrics is not None and state == QUEUED:
+                metrics.duplicates += 1
+            g = g_cell + (costs[neighbor] if costs is not None else 1)
+            p = key(neighbor, g)
+            if state == QUEUED and priority[neighbor] <= p:
+                continue  # Ya hay una entrada igual o mejor
+            status[neighbor] = QUEUED
+            priority[neighbor] = p
+            parent[neighbor] = cell
+            action[neighbor] = index
+            cost[neighbor] = g
+            if weighted_only:
+                buckets.setdefault(p, []).append(neighbor)
+            else:
+                order += 1
+                heapq.heappush(heap, (p, g, order, neighbor))
+            pending += 1
+            if metrics is not None:
+                metrics.pushes += 1
+                metrics.frontier_peak = max(metrics.frontier_peak, pending)
+
+    raise Exception("no solution")
+
+def path(width, parent, action, start, goal, explored, num_explored, timings=None):
+    # Reconstruye (acciones, celdas) recorriendo el array de padres desde la meta
+    path_start = time.perf_counter()
+    actions = []
+    cells = []
+    cell = goal
+    while cell != start:
+        actions.append(ACTIONS[action[cell]])
+        cells.append(divmod(cell, width))
+        cell = parent[cell]
+    actions.reverse()
+    cells.reverse()
+    if timings is not None:
+        timings["path"] = time.perf_counter() - path_start
+    return actions, cells, explored, num_explored
@@ -0,0 +1,163 @@
+import heapq  # Para PriorityQueue
+from collections import deque
+
+class Node():
+    def __init__(self, state, parent, action, cost=0):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.cost = cost
+
+    def __lt__(self, other):
+        return self.cost < other.cost
+
+class StackFrontier():
+    def __init__(self):
+        self.frontier = []
+        self.states = {}  # Índice estado -> ocurrencias, para pertenencia O(1)
+
+    def add(self, node):
+        self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+
+    def contains_state(self, state):
+        return state in self.states
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def __len__(self):
+        return len(self.frontier)
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier.pop()  # LIFO para DFS
+            self.discard_state(node.state)
+            return node
+
+    def discard_state(self, state):
+        count = self.states[state] - 1
+        if count:
+            self.states[state] = count
+        else:
+            del self.states[state]
+
+class QueueFrontier(StackFrontier):
+    def __init__(self):
+        super().__init__()
+        self.frontier = deque()
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier.popleft()  # FIFO para BFS
+            self.discard_state(node.state)
+            return node
+
+class GreedyFrontier():
+    def __init__(self, goal, width=None):
+        self.frontier = []
+        self.entries = {}  # Estado -> entrada vigente del heap (borrado perezoso)
+        self.goal = goal
+        if width is not None:  # Estados como ids de celda (fila * ancho + columna)
+            self.width = width
+            self.goal = divmod(goal, width)
+            self.heuristic = self.cell_heuristic
+
+    def priority(self, node):
+        return self.heuristic(node.state)
+
+    def add(self, node):
+        priority = self.priority(node)
+        current = self.entries.get(node.state)
+        if current is not None and current[0] <= priority:
+            return  # Ya hay una entrada igual o mejor para este estado
+        entry = (priority, node)
+        self.entries[node.state] = entry  # Decrease-key: la entrada vieja queda obsoleta
+        heapq.heappush(self.frontier, entry)
+
+    def contains_state(self, state):
+        return state in self.entries
+
+    def empty(self):
+        # Descartar entradas obsoletas que hayan quedado en la cima
+        while self.frontier and self.entries.get(self.frontier[0][1].state) is not self.frontier[0]:
+            heapq.heappop(self.frontier)
+        return len(self.frontier) == 0
+
+    def __len__(self):
+        return len(self.frontier)  # Incluye entradas obsoletas
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = heapq.heappop(self.frontier)[1]
+            del self.entries[node.state]
+            return node
+
+    def heuristic(self, state):
+        row, col = state
+        goal_row, goal_col = self.goal
+        return abs(row - goal_row) + abs(col - goal_col)  # Distancia Manhattan
+
+    def cell_heuristic(self, cell):
+        row, col = divmod(cell, self.width)
+        goal_row, goal_col = self.goal
+        return abs(row - goal_row) + abs(col - goal_col)
+
+class AStarFrontier(GreedyFrontier):
+    def priority(self, node):
+        return node.cost + self.heuristic(node.state)  # g(n) + h(n)
+
+class BucketFrontier(GreedyFrontier):
+    # Cola monótona por cubetas (algoritmo de Dial) para prioridades enteras que nunca bajan de
+    # la última extraída, como g(n) con costes de terreno positivos: insertar y extraer son O(1)
+    # amortizados en vez de O(log n). Decrease-key con borrado perezoso, como en GreedyFrontier.
+    def __init__(self, goal, width=None):
+        super().__init__(goal, width)
+        self.frontier = {}  # Prioridad -> [entradas]
+        self.current = 0  # Prioridad mínima posible (la de la última extracción)
+        self.size = 0  # Entradas en las cubetas, incluidas las obsoletas
+
+    def add(self, node):
+        priority = self.priority(node)
+        current = self.entries.get(node.state)
+        if current is not None and current[0] <= priority:
+            return
+        entry = (priority, node)
+        self.entries[node.state] = entry
+        self.frontier.setdefault(priority, []).append(entry)
+        self.size += 1
+
+    def empty(self):
+        while self.size:
+            bucket = self.frontier.get(self.current)
+            if not bucket:
+                self.frontier.pop(self.current, None)
+                self.current += 1
+            elif self.entries.get(bucket[-1][1].state) is not bucket[-1]:
+                bucket.pop()  # Entrada obsoleta
+                self.size -= 1
+            else:
+                return False
+        return True
+
+    def __len__(self):
+        return self.size
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier[self.current].pop()[1]
+            self.size -= 1
+            del self.entries[node.state]
+            return node
+
+class DijkstraFrontier(BucketFrontier):
+    def priority(self, node):
+        return node.cost  # g(n): coste acumulado del terreno
@@ -0,0 +1,160 @@
+"""Generador de laberintos sintéticos, en el formato de texto de los laberintoN.txt o en binario.
+
+    python -m laberinto.generator 10001 10001 -o grande.txt --seed 1
+    python -m laberinto.generator 20001 20001 -o grande.lab --loops 0.05
+
+Los laberintos perfectos salen del algoritmo de Eller, un Kruskal fila a fila: solo guarda los
+conjuntos (union-find) de la fila actual, así que el tiempo es lineal en celdas y la memoria
+proporcional al ancho, y las filas se escriben a disco según se generan. Con `loops` > 0 se
+abre además cada muro interior con esa probabilidad, lo que crea ciclos (laberintos trenzados)
+y baja la densidad de muros.
+"""
+
+import argparse
+import os
+import random
+
+from .binfmt import write_rows
+from .grid import Grid
+from .maze import Maze
+
+_TO_TEXT = bytes.maketrans(b"\x00\x01", b" #")
+
+def eller_rows(width, height, seed=None, loops=0.0):
+    # Filas (bytearray de 0/1, 1 = muro) de un laberinto de width x height, ambos impares:
+    # las celdas están en coordenadas impares y los muros entre ellas en las pares
+    rnd = random.Random(seed)
+    cols, rows = (width - 1) // 2, (height - 1) // 2
+    wall = bytes(b"\x01") * width
+    yield bytearray(wall)
+
+    labels = list(range(cols))  # Conjunto de cada celda de la fila actual
+    next_label = cols
+    for row in range(rows):
+        last = row == rows - 1
+        line = bytearray(wall)
+        line[1:width - 1:2] = bytes(cols)
+        members = {}
+        for col, label in enumerate(labels):
+            members.setdefault(label, []).append(col)
+
+        # Uniones horizontales: en la última fila se unen todos los conjuntos distintos. Los
+        # bytes aleatorios de toda la fila se sacan de una vez con randbytes.
+        joins = b"\x01" * cols if last else rnd.randbytes(cols)
+        for col in range(cols - 1):
+            a, b = labels[col], labels[col + 1]
+            if a != b and joins[col] & 1:
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for other in members[b]:
+                    labels[other] = a
+                members[a].extend(members.pop(b))
+                line[2 * col + 2] = 0
+            elif loops and rnd.random() < loops:
+                line[2 * col + 2] = 0
+        yield line
+        if last:
+            break
+
+        # Uniones verticales: cada conjunto baja al menos por una celda
+        below = bytearray(wall)
+        new_labels = [None] * cols
+        downs = rnd.randbytes(cols)
+        for label, cells in members.items():
+            down = [col for col in cells if downs[col] & 1] or [rnd.choice(cells)]
+            for col in down:
+                below[2 * col + 1] = 0
+                new_labels[col] = label
+        for col in range(cols):
+            if new_labels[col] is None:
+                if loops and rnd.random() < loops:
+                    below[2 * col + 1] = 0
+                new_labels[col] = next_label
+                next_label += 1
+        labels = new_labels
+        yield below
+    yield bytearray(wall)
+
+def _dimensions(width, height):
+    # Ancho y alto impares de al menos 3, con el inicio y la meta en esquinas opuestas
+    width, height = max(3, width | 1), max(3, height | 1)
+    return width, height, (1, 1), (height - 2, width - 2)
+
+def generate_maze(width, height, seed=None, loops=0.0):
+    # Laberinto en memoria (Maze), para pruebas y benchmarks
+    width, height, start, goal = _dimensions(width, height)
+    cells = bytearray()
+    for line in eller_rows(width, height, seed, loops):
+        cells += line
+    return Maze.from_grid(Grid(width, height, cells), start, goal)
+
+def dfs_maze(width, height, seed=None, straightness=0.0):
+    # Laberinto perfecto por DFS aleatorio, en memoria. Con `straightness` > 0 se prefiere
+    # seguir recto, lo que da corredores largos como los de laberinto5.txt.
+    width, height, start, goal = _dimensions(width, height)
+    rnd = random.Random(seed)
+    cells = bytearray(b"\x01") * (width * height)
+    first = width + 1
+    cells[first] = 0
+    stack = [(first, None)]
+    moves = (-2 * width, 2 * width, -2, 2)
+    while stack:
+        cell, last = stack[-1]
+        row, col = divmod(cell, width)
+        options = []
+        for move in moves:
+            target = cell + move
+            target_row, target_col = divmod(target, width)
+            if (0 < target_row < height - 1 and 0 < target_col < width - 1
+                    and abs(target_col - col) + abs(target_row - row) == 2 and cells[target]):
+                options.append(move)
+        if not options:
+            stack.pop()
+            continue
+        if last in options and rnd.random() < straightness:
+            move = last
+        else:
+            move = rnd.choice(options)
+        cells[cell + move // 2] = 0
+        cells[cell + move] = 0
+        stack.append((cell + move, move))
+    return Maze.from_grid(Grid(width, height, cells), start, goal)
+
+def write_text(filename, width, height, rows, start, goal):
+    # Escribe las filas como un laberintoN.txt ('#' muro, ' ' libre, 'A' inicio, 'B' meta)
+    with open(filename, "wb") as f:
+        for i, line in enumerate(rows):
+            text = bytearray(line.translate(_TO_TEXT))
+            if i == start[0]:
+                text[start[1]] = ord("A")
+            if i == goal[0]:
+                text[goal[1]] = ord("B")
+            f.write(text + b"\n")
+
+def generate(filename, width, height, seed=None, loops=0.0):
+    # Genera el laberinto directamente en disco, fila a fila. Los .lab van en formato binario
+    # (laberinto.binfmt) y el resto en texto. Devuelve (ancho, alto).
+    width, height, start, goal = _dimensions(width, height)
+    rows = eller_rows(width, height, seed, loops)
+    if os.path.splitext(filename)[1] == ".lab":
+        write_rows(filename, width, height, start, goal, rows)
+    else:
+        write_text(filename, width, height, rows, start, goal)
+    return width, height
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera laberintos aleatorios grandes")
+    parser.add_argument("width", type=int, help="ancho en celdas (se redondea a impar)")
+    parser.add_argument("height", type=int, help="alto en celdas (se redondea a impar)")
+    parser.add_argument("-o", "--output", required=True, help="fichero de salida (.lab para binario)")
+    parser.add_argument("--seed", type=int, help="semilla, para repetir el mismo laberinto")
+    parser.add_argument("--loops", type=float, default=0.0,
+                        help="probabilidad de abrir cada muro interior restante (crea ciclos)")
+    args = parser.parse_args(argv)
+    if not 0 <= args.loops <= 1:
+        parser.error("--loops debe estar entre 0 y 1")
+    width, height = generate(args.output, args.width, args.height, args.seed, args.loops)
+    print(f"{args.output}: {width}x{height}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import re
+
+# Bits de la máscara de vecinos libres de cada celda
+UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
+
+_NOT_FREE = re.compile("[^ AB1-9]")
+TERRAIN = re.compile("[1-9]")  # Dígitos: celdas libres que cuestan ese valor al entrar
+
+_COSTS = bytes(b - 48 if 49 <= b <= 57 else 1 for b in range(256))
+
+def row_bytes(line):
+    # Fila de texto -> bytes con 1 para muro y 0 para libre ('A', 'B', ' ' y los dígitos 1-9)
+    line = _NOT_FREE.sub("\x01", line)
+    line = TERRAIN.sub("\x00", line)
+    return line.replace(" ", "\x00").replace("A", "\x00").replace("B", "\x00").encode("latin-1")
+
+def row_costs(line):
+    # Fila de texto -> coste de entrar en cada celda (el dígito, o 1)
+    return line.encode("latin-1", "replace").translate(_COSTS)
+
+class Grid():
+    def __init__(self, width, height, cells=None, open_mask=None, costs=None):
+        self.width = width
+        self.height = height
+        self.cells = bytearray(width * height) if cells is None else cells  # 1 = muro, por id fila*ancho+columna
+        self.costs = costs  # Coste de entrar en cada celda (1-9), o None si todas cuestan 1
+
+        # Tabla máscara -> ((acción, desplazamiento), ...) en el orden de Maze.neighbors
+        moves = (("up", -width, UP), ("down", width, DOWN), ("left", -1, LEFT), ("right", 1, RIGHT))
+        self.offsets = tuple(
+            tuple((action, delta) for action, delta, bit in moves if mask & bit)
+            for mask in range(16)
+        )
+        self.open = self.build_open() if open_mask is None else open_mask
+
+    def build_open(self):
+        # Máscara de vecinos libres de todas las celdas de una vez, con aritmética de enteros
+        # grandes (cada byte vale 0 o 1, así que los desplazamientos no se pisan entre bytes)
+        width, size = self.width, self.width * self.height
+        if size == 0:
+            return bytearray()
+        free = bytes(self.cells).translate(bytes([1, 0]) + bytes(254))
+        inner = (b"\x00" + b"\x01" * (width - 1)) * self.height  # Columnas con vecino a la izquierda
+
+        def as_int(data):
+            return int.from_bytes(data, "little")
+
+        up = as_int(bytes(width) + free[:size - width])
+        down = as_int(free[width:] + bytes(width))
+        left = as_int(b"\x00" + free[:-1]) & as_int(inner)
+        right = as_int(free[1:] + b"\x00") & as_int(inner[1:] + b"\x00")
+        mask = up | (down << 1) | (left << 2) | (right << 3)
+        return bytearray(mask.to_bytes(size, "little"))
+
+    def cell(self, state):
+        row, col = state
+        return row * self.width + col
+
+    def state(self, cell):
+        return divmod(cell, self.width)
+
+    def is_wall(self, cell):
+        return self.cells[cell] == 1
+
+    def set_wall(self, cell, wall=True):
+        # Pone o quita un muro y corrige la máscara de sus vecinas (la de la propia celda no
+        # cambia: como en build_open, indica qué vecinas están libres). Devuelve si cambió.
+        wall = 1 if wall else 0
+        if self.cells[cell] == wall:
+            return False
+        self.cells[cell] = wall
+        width = self.width
+        row, col = divmod(cell, width)
+        for bit, delta, inside in ((DOWN, -width, row > 0), (UP, width, row < self.height - 1),
+                                   (RIGHT, -1, col > 0), (LEFT, 1, col < width - 1)):
+            if inside:  # `bit` es el sentido desde la vecina hacia esta celda
+                if wall:
+                    self.open[cell + delta] &= ~bit
+                else:
+                    self.open[cell + delta] |= bit
+        return True
+
+    def cost(self, cell):
+        return self.costs[cell] if self.costs is not None else 1
+
+    def neighbors(self, cell):
+        return self.offsets[self.open[cell]]
+
+    # Acceso compatible con la antigua lista de listas: walls[i][j]
+    def __getitem__(self, row):
+        start = row * self.width
+        return memoryview(self.cells)[start:start + self.width]
+
+    def __iter__(self):
+        for row in range(self.height):
+            yield self[row]
+
+    def __len__(self):
+        return self.height
+
+class StateSet():
+    # Conjunto de ids de celda que se consulta e itera como un set de (fila, columna)
+    def __init__(self, width, cells):
+        self.width = width
+        self.cells = cells
+
+    def __contains__(self, state):
+        row, col = state
+        return 0 <= col < self.width and row * self.width + col in self.cells
+
+    def __iter__(self):
+        width = self.width
+        for cell in self.cells:
+            yield divmod(cell, width)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __eq__(self, other):
+        if isinstance(other, StateSet):
+            return self.width == other.width and self.cells == other.cells
+        return set(self) == other
+
+    def __repr__(self):
+        return f"StateSet({len(self.cells)} celdas)"
@@ -0,0 +1,329 @@
+import heapq
+import mmap
+import time
+from collections import OrderedDict, deque
+
+from .binfmt import HEADER, MAGIC, WEIGHTED_MAGIC, unpack_cells
+from .corridors import cell_actions
+from .grid import Grid, StateSet
+
+# Búsqueda jerárquica (HPA*) para laberintos que no caben en memoria. El laberinto se divide
+# en tiles de tile_size x tile_size; al construir se recorre tile a tile para colocar entradas
+# en los bordes entre tiles vecinos y calcular las distancias entre las entradas de cada tile.
+# Una consulta busca con A* en ese grafo abstracto y luego refina a celdas solo los tiles del
+# camino elegido. Los tiles se leen del fichero binario (laberinto.binfmt) según hacen falta y
+# se guardan en una caché LRU de max_tiles, así que la memoria es la del grafo abstracto más
+# esa caché. El camino es casi óptimo: puede ser algo más largo que el de A* sobre celdas.
+
+INF = float("inf")
+MAX_SEGMENT = 6  # Tramos de borde más largos llevan dos entradas, una en cada extremo
+
+class BinaryTiles():
+    # Lee rectángulos de un laberinto binario mapeado en memoria, sin desempaquetarlo entero
+    def __init__(self, filename):
+        self.file = open(filename, "rb")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, width, height, start_row, start_col, goal_row, goal_col = HEADER.unpack_from(self.mm)
+        if magic not in (MAGIC, WEIGHTED_MAGIC):
+            raise Exception(f"{filename} no es un laberinto binario")
+        self.width, self.height = width, height
+        self.start, self.goal = (start_row, start_col), (goal_row, goal_col)
+        self.weighted = magic == WEIGHTED_MAGIC
+        self.costs_offset = HEADER.size + (width * height + 7) // 8
+
+    def read(self, row0, col0, rows, cols):
+        # (muros, costes o None) del rectángulo, fila a fila
+        cells = bytearray()
+        costs = bytearray() if self.weighted else None
+        for row in range(row0, row0 + rows):
+            bit = row * self.width + col0
+            first, last = bit // 8, (bit + cols + 7) // 8
+            unpacked = unpack_cells(self.mm[HEADER.size + first:HEADER.size + last], (last - first) * 8)
+            cells += unpacked[bit % 8:bit % 8 + cols]
+            if costs is not None:
+                offset = self.costs_offset + row * self.width + col0
+                costs += self.mm[offset:offset + cols]
+        return cells, costs
+
+    def close(self):
+        self.mm.close()
+        self.file.close()
+
+class GridTiles():
+    # Misma interfaz que BinaryTiles sobre un Maze ya cargado
+    def __init__(self, maze):
+        self.grid = maze.walls
+        self.width, self.height = maze.width, maze.height
+        self.start, self.goal = maze.start, maze.goal
+
+    def read(self, row0, col0, rows, cols):
+        grid, width = self.grid, self.width
+        cells = bytearray()
+        costs = bytearray() if grid.costs is not None else None
+        for row in range(row0, row0 + rows):
+            offset = row * width + col0
+            cells += grid.cells[offset:offset + cols]
+            if costs is not None:
+                costs += grid.costs[offset:offset + cols]
+        return cells, costs
+
+    def close(self):
+        pass
+
+class Tile():
+    def __init__(self, source, row0, col0, rows, cols):
+        self.row0, self.col0 = row0, col0
+        cells, costs = source.read(row0, col0, rows, cols)
+        self.grid = Grid(cols, rows, cells, costs=costs)  # Sin vecinos fuera del tile
+        self.maze_width = source.width
+
+    def local(self, cell):
+        row, col = divmod(cell, self.maze_width)
+        return (row - self.row0) * self.grid.width + col - self.col0
+
+    def cell(self, local):
+        row, col = divmod(local, self.grid.width)
+        return (row + self.row0) * self.maze_width + col + self.col0
+
+def tile_search(grid, source, targets=None, reverse=False):
+    # Dijkstra dentro de un tile (ids locales). Con reverse=True, dist[c] es el coste de ir de
+    # c a `source` (se paga la celda de la que se sale, no la de llegada).
+    dist = {source: 0}
+    parents = {}
+    remaining = set(targets) if targets is not None else None
+    if grid.costs is None:
+        # Sin terreno todos los pasos cuestan 1: basta una BFS, bastante más rápida
+        offsets, open_mask = grid.offsets, grid.open
+        queue = deque([source])
+        while queue:
+            cell = queue.popleft()
+            if remaining is not None:
+                remaining.discard(cell)
+                if not remaining:
+                    break
+            distance = dist[cell] + 1
+            for _, delta in offsets[open_mask[cell]]:
+                neighbor = cell + delta
+                if neighbor not in dist:
+                    dist[neighbor] = distance
+                    parents[neighbor] = cell
+                    queue.append(neighbor)
+        return dist, parents
+    heap = [(0, source)]
+    while heap:
+        d, cell = heapq.heappop(heap)
+        if d > dist[cell]:
+            continue
+        if remaining is not None:
+            remaining.discard(cell)
+            if not remaining:
+                break
+        leave = grid.cost(cell)
+        for _, delta in grid.offsets[grid.open[cell]]:
+            neighbor = cell + delta
+            distance = d + (leave if reverse else grid.cost(neighbor))
+            if distance < dist.get(neighbor, INF):
+                dist[neighbor] = distance
+                parents[neighbor] = cell
+                heapq.heappush(heap, (distance, neighbor))
+    return dist, parents
+
+class HierarchicalMaze():
+    def __init__(self, source, tile_size=32, max_tiles=64):
+        if isinstance(source, str):
+            source = BinaryTiles(source)
+        elif not hasattr(source, "read"):
+            source = GridTiles(source)  # Un Maze
+        self.source = source
+        self.width, self.height = source.width, source.height
+        self.start, self.goal = source.start, source.goal
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.tiles = OrderedDict()  # (fila, columna) de tile -> Tile, de menos a más usado
+        self.tiles_loaded = 0
+        self.nodes = {}  # (fila, columna) de tile -> ids de celda de sus entradas
+        self.edges = {}  # Entrada -> [(entrada vecina, coste)]
+        self.build()
+
+    def tile_key(self, cell):
+        row, col = divmod(cell, self.width)
+        return row // self.tile_size, col // self.tile_size
+
+    def tile(self, key):
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            return tile
+        size = self.tile_size
+        row0, col0 = key[0] * size, key[1] * size
+        tile = Tile(self.source, row0, col0, min(size, self.height - row0), min(size, self.width - col0))
+        self.tiles[key] = tile
+        self.tiles_loaded += 1
+        while len(self.tiles) > self.max_tiles:
+            self.tiles.popitem(last=False)
+        return tile
+
+    def add_node(self, cell):
+        if cell not in self.edges:
+            self.edges[cell] = []
+            self.nodes.setdefault(self.tile_key(cell), []).append(cell)
+
+    def add_entrances(self, pairs, costs):
+        # pairs: [(celda a, celda b) o None] a lo largo de un borde entre dos tiles, con None donde
+        # alguna de las dos es muro; costs: coste de entrar en cada una. Cada tramo continuo de
+        # pares libres recibe una entrada en el centro, o dos en los extremos si es largo.
+        segment = []
+        for index, pair in enumerate(pairs + [None]):
+            if pair is not None:
+                segment.append(index)
+                continue
+            if len(segment) > MAX_SEGMENT:
+                chosen = (segment[0], segment[-1])
+            elif segment:
+                chosen = (segment[len(segment) // 2],)
+            else:
+                chosen = ()
+            for position in chosen:
+                a, b = pairs[position]
+                cost_a, cost_b = costs[position]
+                self.add_node(a)
+                self.add_node(b)
+                self.edges[a].append((b, cost_b))
+                self.edges[b].append((a, cost_a))
+            segment = []
+
+    def build(self):
+        size, width, height = self.tile_size, self.width, self.height
+        tile_rows, tile_cols = -(-height // size), -(-width // size)
+        for ty in range(tile_rows):
+            for tx in range(tile_cols):
+                row0, col0 = ty * size, tx * size
+                rows, cols = min(size, height - row0), min(size, width - col0)
+                if tx + 1 < tile_cols:  # Borde con el tile de la derecha
+                    cells, costs = self.source.read(row0, col0 + cols - 1, rows, 2)
+                    pairs, pair_costs = [], []
+                    for i in range(rows):
+                        a = (row0 + i) * width + col0 + cols - 1
+                        pairs.append((a, a + 1) if not cells[2 * i] and not cells[2 * i + 1] else None)
+                        pair_costs.append((costs[2 * i], costs[2 * i + 1]) if costs is not None else (1, 1))
+                    self.add_entrances(pairs, pair_costs)
+                if ty + 1 < tile_rows:  # Borde con el tile de abajo
+                    cells, costs = self.source.read(row0 + rows - 1, col0, 2, cols)
+                    pairs, pair_costs = [], []
+                    for j in range(cols):
+                        a = (row0 + rows - 1) * width + col0 + j
+                        pairs.append((a, a + width) if not cells[j] and not cells[cols + j] else None)
+                        pair_costs.append((costs[j], costs[cols + j]) if costs is not None else (1, 1))
+                    self.add_entrances(pairs, pair_costs)
+                self.connect_tile((ty, tx))
+
+    def connect_tile(self, key):
+        # Distancias dentro del tile entre todas sus entradas (ya están todas: las de arriba y
+        # la izquierda se pusieron con los tiles anteriores)
+        nodes = self.nodes.get(key, [])
+        if len(nodes) < 2:
+            return
+        tile = self.tile(key)
+        local = [tile.local(cell) for cell in nodes]
+        for cell, source in zip(nodes, local):
+            dist, _ = tile_search(tile.grid, source, local)
+            for other, target in zip(nodes, local):
+                if other != cell and target in dist:
+                    self.edges[cell].append((other, dist[target]))
+
+    def solve(self, start=None, goal=None, step_callback=None):
+        from .search import SolveResult  # Diferida: search importa este paquete
+
+        width = self.width
+        start = start if start is not None else self.start
+        goal = goal if goal is not None else self.goal
+        start, goal = start[0] * width + start[1], goal[0] * width + goal[1]
+        timings = {}
+        search_start = time.perf_counter()
+
+        # Conectar inicio y meta con las entradas de sus tiles (aristas temporales)
+        extra = {}
+        start_tile, goal_tile = self.tile(self.tile_key(start)), self.tile(self.tile_key(goal))
+        if start_tile.grid.cells[start_tile.local(start)] or goal_tile.grid.cells[goal_tile.local(goal)]:
+            raise Exception("no solution")
+        dist, _ = tile_search(start_tile.grid, start_tile.local(start))
+        extra[start] = [(node, dist[start_tile.local(node)]) for node in self.nodes.get(self.tile_key(start), [])
+                        if start_tile.local(node) in dist]
+        if self.tile_key(start) == self.tile_key(goal) and start_tile.local(goal) in dist:
+            extra[start].append((goal, dist[start_tile.local(goal)]))
+        dist, _ = tile_search(goal_tile.grid, goal_tile.local(goal), reverse=True)
+        for node in self.nodes.get(self.tile_key(goal), []):
+            if goal_tile.local(node) in dist:
+                extra.setdefault(node, []).append((goal, dist[goal_tile.local(node)]))
+
+        # A* sobre el grafo abstracto
+        goal_row, goal_col = divmod(goal, width)
+
+        def heuristic(cell):
+            row, col = divmod(cell, width)
+            return abs(row - goal_row) + abs(col - goal_col)
+
+        g = {start: 0}
+        parents = {}
+        heap = [(heuristic(start), 0, start)]
+        explored = set()
+        num_explored = 0
+        while heap:
+            _, cost, node = heapq.heappop(heap)
+            if node in explored:
+                continue
+            explored.add(node)
+            num_explored += 1
+            if step_callback:
+                step_callback(divmod(node, width))
+            if node == goal:
+                break
+            for neighbor, length in self.edges.get(node, []) + extra.get(node, []):
+                total = cost + length
+                if total < g.get(neighbor, INF):
+                    g[neighbor] = total
+                    parents[neighbor] = node
+                    heapq.heappush(heap, (total + heuristic(neighbor), total, neighbor))
+        else:
+            raise Exception("no solution")
+
+        path_start = time.perf_counter()
+        route = [goal]
+        while route[-1] != start:
+            route.append(parents[route[-1]])
+        route.reverse()
+        cells = self.refine(route)
+        timings["path"] = time.perf_counter() - path_start
+        timings["search"] = time.perf_counter() - search_start - timings["path"]
+
+        actions = cell_actions(width, start, cells)
+        return SolveResult("HPA*", actions, [divmod(cell, width) for cell in cells], StateSet(width, explored),
+                           num_explored, timings, cost=g[goal])
+
+    def refine(self, route):
+        # Camino de celdas a partir de la ruta abstracta; solo se cargan los tiles que atraviesa
+        width = self.width
+        cells = []
+        for a, b in zip(route, route[1:]):
+            row_a, col_a = divmod(a, width)
+            row_b, col_b = divmod(b, width)
+            if abs(row_a - row_b) + abs(col_a - col_b) == 1 and self.tile_key(a) != self.tile_key(b):
+                cells.append(b)  # Cruce de borde entre tiles
+                continue
+            tile = self.tile(self.tile_key(a))
+            source, target = tile.local(a), tile.local(b)
+            _, parents = tile_search(tile.grid, source, [target])
+            segment = []
+            while target != source:
+                segment.append(tile.cell(target))
+                target = parents[target]
+            cells.extend(reversed(segment))
+        return cells
+
+    def close(self):
+        self.tiles.clear()
+        self.source.close()
+
+    def __repr__(self):
+        return (f"HierarchicalMaze({self.width}x{self.height}, tiles de {self.tile_size}, "
+                f"{len(self.edges)} entradas, {len(self.tiles)} tiles en caché)")
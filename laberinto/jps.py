@@ -0,0 +1,100 @@
+import heapq
+import time
+
+from .grid import UP, DOWN, LEFT, RIGHT
+
+# Jump Point Search adaptado a movimientos en 4 direcciones. El orden canónico es "primero en
+# vertical, luego en horizontal": los saltos horizontales se detienen en vecinos forzados (una
+# apertura arriba o abajo que no existía en la celda anterior) y los verticales en cualquier
+# celda desde la que un salto horizontal encuentre un punto de salto. A* solo empuja al heap
+# los puntos de salto, y el camino entre ellos son tramos rectos.
+
+_REVERSE = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+
+def jump_point_search(maze, start, goal, step_callback=None, timings=None):
+    grid = maze.walls
+    width, open_mask = grid.width, grid.open
+    start, goal = grid.cell(start), grid.cell(goal)
+    goal_row, goal_col = divmod(goal, width)
+    directions = ((UP, -width), (DOWN, width), (LEFT, -1), (RIGHT, 1))
+
+    def jump_horizontal(cell, bit, delta):
+        while open_mask[cell] & bit:
+            previous = cell
+            cell += delta
+            if cell == goal:
+                return cell
+            mask, previous_mask = open_mask[cell], open_mask[previous]
+            if (mask & UP and not previous_mask & UP) or (mask & DOWN and not previous_mask & DOWN):
+                return cell  # Vecino forzado
+        return None
+
+    def jump_vertical(cell, bit, delta):
+        while open_mask[cell] & bit:
+            cell += delta
+            if cell == goal:
+                return cell
+            if jump_horizontal(cell, LEFT, -1) is not None or jump_horizontal(cell, RIGHT, 1) is not None:
+                return cell
+        return None
+
+    def heuristic(cell):
+        row, col = divmod(cell, width)
+        return abs(row - goal_row) + abs(col - goal_col)
+
+    g = {start: 0}
+    parents = {}  # Punto de salto -> (punto de salto anterior, bit de la dirección de llegada)
+    heap = [(heuristic(start), start)]
+    explored = set()
+    num_explored = 0
+
+    while heap:
+        priority, cell = heapq.heappop(heap)
+        if cell in explored or priority > g[cell] + heuristic(cell):
+            continue  # Entrada obsoleta (borrado perezoso)
+        num_explored += 1
+        if step_callback:
+            step_callback(divmod(cell, width))
+
+        if cell == goal:
+            path_start = time.perf_counter()
+            actions, cells = expand_path(width, parents, goal)
+            if timings is not None:
+                timings["path"] = time.perf_counter() - path_start
+            return actions, [divmod(c, width) for c in cells], explored, num_explored
+
+        explored.add(cell)
+        arrival = parents[cell][1] if cell in parents else None
+        for bit, delta in directions:
+            if bit == _REVERSE.get(arrival):
+                continue  # Volver por donde se llegó nunca es canónico
+            if bit in (UP, DOWN):
+                point = jump_vertical(cell, bit, delta)
+            else:
+                point = jump_horizontal(cell, bit, delta)
+            if point is None:
+                continue
+            cost = g[cell] + abs(point - cell) // abs(delta)
+            if cost < g.get(point, cost + 1):
+                g[point] = cost
+                parents[point] = (cell, bit)
+                heapq.heappush(heap, (cost + heuristic(point), point))
+
+    raise Exception("no solution")
+
+def expand_path(width, parents, goal):
+    # Rellena los tramos rectos entre puntos de salto. Devuelve (acciones, ids de celda)
+    steps = {UP: ("up", -width), DOWN: ("down", width), LEFT: ("left", -1), RIGHT: ("right", 1)}
+    actions = []
+    cells = []
+    cell = goal
+    while cell in parents:
+        previous, bit = parents[cell]
+        action, delta = steps[bit]
+        while cell != previous:
+            actions.append(action)
+            cells.append(cell)
+            cell -= delta
+    actions.reverse()
+    cells.reverse()
+    return actions, cells
@@ -0,0 +1,136 @@
+import heapq
+import time
+
+from .corridors import cell_actions
+from .grid import StateSet
+
+# Lifelong Planning A* (LPA*) para laberintos que cambian: guarda g (coste conocido) y rhs
+# (coste según los vecinos) de cada celda tocada entre una búsqueda y la siguiente. Al poner o
+# quitar un muro solo se recalculan esa celda y sus vecinas, y la siguiente búsqueda expande
+# únicamente las celdas cuyo coste cambia, en vez de empezar de cero. Con coste de terreno,
+# entrar en una celda cuesta su valor; la heurística es la distancia Manhattan.
+
+INF = float("inf")
+
+class LPAStar():
+    def __init__(self, maze, start=None, goal=None):
+        self.maze = maze
+        grid = self.grid = maze.walls
+        self.start = grid.cell(maze.start if start is None else start)
+        self.goal = grid.cell(maze.goal if goal is None else goal)
+        self.goal_row, self.goal_col = divmod(self.goal, grid.width)
+        self.g = {}  # Celda -> coste conocido desde el inicio (ausente = infinito)
+        self.rhs = {self.start: 0}  # Celda -> mejor coste a través de sus vecinas
+        self.queue = []  # Heap de (k1, k2, celda), con borrado perezoso
+        self.queued = {}  # Celda -> clave vigente en el heap
+        self.push(self.start)
+
+    def heuristic(self, cell):
+        row, col = divmod(cell, self.grid.width)
+        return abs(row - self.goal_row) + abs(col - self.goal_col)
+
+    def key(self, cell):
+        best = min(self.g.get(cell, INF), self.rhs.get(cell, INF))
+        return (best + self.heuristic(cell), best)
+
+    def push(self, cell):
+        key = self.key(cell)
+        self.queued[cell] = key
+        heapq.heappush(self.queue, (key[0], key[1], cell))
+
+    def update(self, cell):
+        grid = self.grid
+        if cell != self.start:
+            if grid.cells[cell]:
+                self.rhs.pop(cell, None)  # Muro: inalcanzable
+            else:
+                g = self.g
+                best = min((g.get(cell + delta, INF) for _, delta in grid.offsets[grid.open[cell]]), default=INF)
+                if best == INF:
+                    self.rhs.pop(cell, None)
+                else:
+                    self.rhs[cell] = best + grid.cost(cell)
+        self.queued.pop(cell, None)
+        if self.g.get(cell, INF) != self.rhs.get(cell, INF):
+            self.push(cell)
+
+    def wall_changed(self, cell):
+        # Llamado por Maze.set_wall después de cambiar la rejilla: la máscara de `cell` indica
+        # sus vecinas libres, que son las que pueden ganar o perder un camino a través de ella
+        if cell in (self.start, self.goal):
+            raise ValueError("El inicio y la meta no pueden ser muros")
+        self.update(cell)
+        for _, delta in self.grid.offsets[self.grid.open[cell]]:
+            self.update(cell + delta)
+
+    def compute(self, step_callback=None):
+        # Expande celdas inconsistentes hasta que el coste de la meta es definitivo.
+        # Devuelve (ids expandidos, número de expansiones).
+        grid, g, queue, queued = self.grid, self.g, self.queue, self.queued
+        width, goal = grid.width, self.goal
+        explored = set()
+        num_explored = 0
+        while queue:
+            k1, k2, cell = queue[0]
+            if queued.get(cell) != (k1, k2):
+                heapq.heappop(queue)  # Entrada obsoleta
+                continue
+            if (k1, k2) >= self.key(goal) and self.rhs.get(goal, INF) == g.get(goal, INF):
+                break
+            heapq.heappop(queue)
+            del queued[cell]
+            num_explored += 1
+            explored.add(cell)
+            if step_callback:
+                step_callback(divmod(cell, width))
+
+            rhs = self.rhs.get(cell, INF)
+            if g.get(cell, INF) > rhs:
+                g[cell] = rhs  # Sobreconsistente: el coste baja
+            else:
+                g.pop(cell, None)  # Subconsistente: el coste sube, volver a calcularlo
+                self.update(cell)
+            for _, delta in grid.offsets[grid.open[cell]]:
+                self.update(cell + delta)
+        return explored, num_explored
+
+    def path(self):
+        # Camino desde la meta hacia atrás, eligiendo siempre la vecina de menor g
+        grid, g = self.grid, self.g
+        cell = self.goal
+        if g.get(cell, INF) == INF:
+            raise Exception("no solution")
+        cells = []
+        while cell != self.start:
+            cells.append(cell)
+            best = min((g.get(cell + delta, INF), cell + delta) for _, delta in grid.offsets[grid.open[cell]])
+            if best[0] >= g[cell]:
+                raise Exception("no solution")  # No debería ocurrir con g consistente
+            cell = best[1]
+        cells.reverse()
+        return cells
+
+    def search(self, step_callback=None, timings=None):
+        # Motor con la interfaz de ALGORITHMS: (acciones, celdas, explorados, número explorados)
+        explored, num_explored = self.compute(step_callback)
+        path_start = time.perf_counter()
+        cells = self.path()
+        width = self.grid.width
+        actions = cell_actions(width, self.start, cells)
+        if timings is not None:
+            timings["path"] = time.perf_counter() - path_start
+        return actions, [divmod(cell, width) for cell in cells], explored, num_explored
+
+    def solve(self, step_callback=None):
+        from .search import SolveResult  # Diferida: search importa este módulo
+
+        timings = {}
+        search_start = time.perf_counter()
+        actions, cells, explored, num_explored = self.search(step_callback, timings)
+        timings["search"] = time.perf_counter() - search_start - timings.get("path", 0.0)
+        return SolveResult("LPA*", actions, cells, StateSet(self.grid.width, explored), num_explored, timings,
+                           cost=self.g[self.goal])
+
+def lpa_search(maze, start, goal, step_callback=None, timings=None):
+    # LPA* desde cero: la primera búsqueda equivale a A*
+    return LPAStar(maze, start, goal).search(step_callback, timings)
@@ -0,0 +1,208 @@
+import time
+
+from .grid import TERRAIN, Grid, StateSet, row_bytes, row_costs
+
+def load_grid(filename):
+    # Lee el laberinto de texto línea a línea en dos pasadas (medidas y luego contenido),
+    # escribiendo directamente en la rejilla compacta: la memoria es la de la rejilla, no la
+    # de copias del fichero. Devuelve (grid, start, goal). Si hay dígitos de terreno, la
+    # rejilla lleva también el coste de cada celda.
+    height = width = 0
+    weighted = False
+    with open(filename) as f:
+        for line in f:
+            height += 1
+            width = max(width, len(line.rstrip("\r\n")))
+            weighted = weighted or TERRAIN.search(line) is not None
+
+    cells = bytearray(width * height)  # Las líneas cortas quedan rellenas de celdas libres
+    costs = bytearray(b"\x01") * (width * height) if weighted else None
+    starts = goals = 0
+    start = goal = None
+    with open(filename) as f:
+        for i, line in enumerate(f):
+            line = line.rstrip("\r\n")
+            cells[i * width:i * width + len(line)] = row_bytes(line)
+            if weighted:
+                costs[i * width:i * width + len(line)] = row_costs(line)
+            if "A" in line:
+                starts += line.count("A")
+                start = (i, line.index("A"))
+            if "B" in line:
+                goals += line.count("B")
+                goal = (i, line.index("B"))
+
+    if starts != 1 or goals != 1:
+        raise Exception("Laberinto debe tener exactamente un inicio 'A' y un final 'B'")
+    return Grid(width, height, cells, costs=costs), start, goal
+
+class Maze():
+    def __init__(self, filename):
+        from .binfmt import is_binary, load_binary  # Diferida: binfmt también se ejecuta con -m
+
+        parse_start = time.perf_counter()
+        if is_binary(filename):
+            grid, start, goal = load_binary(filename)  # Formato binario mapeado en memoria
+        else:
+            grid, start, goal = load_grid(filename)
+        self.setup(grid, start, goal)
+        self.parse_time = time.perf_counter() - parse_start
+
+    @classmethod
+    def from_grid(cls, grid, start, goal):
+        maze = cls.__new__(cls)
+        maze.setup(grid, start, goal)
+        return maze
+
+    @classmethod
+    def from_binary(cls, filename):
+        from .binfmt import load_binary
+
+        return cls.from_grid(*load_binary(filename))
+
+    def setup(self, grid, start, goal):
+        self.walls, self.start, self.goal = grid, start, goal
+        self.height = self.walls.height
+        self.width = self.walls.width
+
+        self.solution = None
+        self.explored = set()
+        self.num_explored = 0
+        self.corridor_graph = None
+        self.component_index = None  # ComponentIndex (laberinto.components), construido al pedirlo
+        self.parse_time = None  # Segundos en leer el fichero, si viene de uno
+        self.metrics = None  # SearchMetrics de la última búsqueda
+        self.grid_hash = None  # Hash del contenido (laberinto.cache), calculado al pedirlo
+        self.planner = None  # LPAStar del modo dinámico (replan)
+
+    def corridors(self):
+        # Índice de corredores, construido una sola vez por laberinto
+        if self.corridor_graph is None:
+            from .corridors import CorridorGraph
+
+            self.corridor_graph = CorridorGraph(self.walls)
+        return self.corridor_graph
+
+    def components(self):
+        # Índice de componentes conexas, construido una sola vez y corregido en set_wall
+        if self.component_index is None:
+            from .components import ComponentIndex
+
+            self.component_index = ComponentIndex(self.walls)
+        return self.component_index
+
+    def set_wall(self, state, wall=True):
+        # Pone o quita un muro en `state`. Los índices derivados de la rejilla se descartan; el
+        # de componentes y el planificador de replan(), si los hay, se corrigen en su sitio.
+        if state in (self.start, self.goal):
+            raise ValueError("El inicio y la meta no pueden ser muros")
+        cell = self.walls.cell(state)
+        if not self.walls.set_wall(cell, wall):
+            return False
+        self.corridor_graph = None
+        self.grid_hash = None
+        self.solution = None
+        if self.component_index is not None:
+            self.component_index.wall_changed(cell)
+        if self.planner is not None:
+            self.planner.wall_changed(cell)
+        return True
+
+    def toggle_wall(self, state):
+        # Devuelve True si la celda ha quedado como muro
+        wall = not self.walls.is_wall(self.walls.cell(state))
+        self.set_wall(state, wall)
+        return wall
+
+    def replan(self, step_callback=None):
+        # Modo dinámico: como solve(), pero con un LPA* que se conserva entre cambios de muros,
+        # así que tras set_wall/toggle_wall solo se repara la zona afectada
+        from .lpa import LPAStar
+
+        start, goal = self.walls.cell(self.start), self.walls.cell(self.goal)
+        if self.planner is None or (self.planner.start, self.planner.goal) != (start, goal):
+            self.planner = LPAStar(self)
+        if not self.components().reachable(start, goal):
+            raise Exception("no solution")
+        result = self.planner.solve(step_callback)
+        self.solution = result.solution
+        self.explored = result.explored
+        self.num_explored = result.num_explored
+        self.metrics = result.metrics
+        return result
+
+    def cell_sets(self):
+        # Celdas de la solución y exploradas como ids, para consultas sin crear tuplas
+        solution = set()
+        if self.solution is not None:
+            solution = {self.walls.cell(state) for state in self.solution[1]}
+        if isinstance(self.explored, StateSet):
+            explored = self.explored.cells
+        else:
+            explored = {self.walls.cell(state) for state in self.explored}
+        return solution, explored
+
+    def print(self):
+        solution, _ = self.cell_sets()
+        show_solution = self.solution is not None
+        start, goal = self.walls.cell(self.start), self.walls.cell(self.goal)
+        cells, costs = self.walls.cells, self.walls.costs
+        print()
+        for i in range(self.height):
+            line = []
+            for cell in range(i * self.width, (i + 1) * self.width):
+                if cells[cell]:
+                    line.append("█")
+                elif cell == start:
+                    line.append("A")
+                elif cell == goal:
+                    line.append("B")
+                elif show_solution and cell in solution:
+                    line.append("*")
+                elif costs is not None and costs[cell] > 1:
+                    line.append(str(costs[cell]))  # Terreno
+                else:
+                    line.append(" ")
+            print("".join(line))
+        print()
+
+    def neighbors(self, state):
+        cell = self.walls.cell(state)
+        width = self.width
+        return [(action, divmod(cell + delta, width)) for action, delta in self.walls.neighbors(cell)]
+
+    def solve(self, step_callback=None, algorithm="BFS", indexed=False, **options):
+        from .search import solve  # Importación diferida para evitar el ciclo maze <-> search
+
+        self.num_explored = 0
+        self.explored = StateSet(self.width, set())
+        callback = None
+        if step_callback:
+            # Mantener self.explored al día durante la búsqueda, para poder animarla
+            previous = []
+
+            def callback(state):
+                if previous:
+                    self.explored.cells.add(self.walls.cell(previous.pop()))
+                previous.append(state)
+                step_callback(state)
+
+        # options: metrics, sample y sample_every de laberinto.search.solve
+        result = solve(self, algorithm=algorithm, step_callback=callback, indexed=indexed, **options)
+        if self.parse_time is not None:
+            result.timings["parse"] = self.parse_time
+        self.solution = result.solution
+        self.explored = result.explored
+        self.num_explored = result.num_explored
+        self.metrics = result.metrics
+        return result
+
+    def output_image(self, filename, show_solution=True, show_explored=False, current_state=None,
+                     cell_size=50, cell_border=2):
+        from .render import maze_image  # PIL (y NumPy, si está) solo hacen falta para dibujar
+
+        render_start = time.perf_counter()
+        img = maze_image(self, show_solution, show_explored, current_state, cell_size, cell_border)
+        img.save(filename)
+        if self.metrics is not None:
+            self.metrics.timings["render"] = time.perf_counter() - render_start
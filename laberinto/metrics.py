@@ -0,0 +1,42 @@
+import json
+
+# Métricas de una búsqueda: tiempos por fase (parse, search, path, render), nodos por segundo
+# y, si se piden con solve(..., metrics=True), los contadores de la frontera, que flat_search
+# anota en su propio bucle.
+
+class SearchMetrics():
+    def __init__(self, algorithm, timings=None):
+        self.algorithm = algorithm
+        self.timings = timings if timings is not None else {}  # Segundos por fase
+        self.num_explored = 0
+        # Contadores de la frontera; None si el motor no usa una (Wavefront, JPS, ...)
+        self.pushes = None
+        self.pops = None
+        self.duplicates = None  # Sucesores que ya estaban en la frontera
+        self.frontier_peak = None
+
+    def start_counting(self):
+        self.pushes = self.pops = self.duplicates = self.frontier_peak = 0
+
+    @property
+    def nodes_per_second(self):
+        seconds = self.timings.get("search")
+        return self.num_explored / seconds if seconds else None
+
+    def to_dict(self):
+        return {
+            "algorithm": self.algorithm,
+            "timings": dict(self.timings),
+            "num_explored": self.num_explored,
+            "nodes_per_second": self.nodes_per_second,
+            "pushes": self.pushes,
+            "pops": self.pops,
+            "duplicates": self.duplicates,
+            "frontier_peak": self.frontier_peak,
+        }
+
+    def to_json(self, **options):
+        return json.dumps(self.to_dict(), **options)
+
+    def __repr__(self):
+        return f"SearchMetrics({self.to_dict()!r})"
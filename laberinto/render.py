@@ -0,0 +1,249 @@
+from PIL import Image, ImageDraw
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Sin NumPy se dibuja celda a celda
+
+# Etiquetas de celda y sus colores, con la misma prioridad que Maze.output_image
+WALL, START, GOAL, CURRENT, SOLUTION, EXPLORED, FREE, BORDER = range(8)
+COLORS = (
+    (40, 40, 40),  # Muro
+    (255, 0, 0),  # Inicio
+    (0, 171, 28),  # Meta
+    (255, 255, 0),  # Estado actual
+    (220, 235, 113),  # Solución
+    (212, 97, 85),  # Explorado
+    (237, 240, 252),  # Libre
+    (0, 0, 0),  # Borde entre celdas
+)
+
+def cell_labels(maze, current_state=None, show_solution=True, show_explored=False):
+    # Etiqueta de cada celda (bytearray indexado por id de celda)
+    grid = maze.walls
+    solution, explored = maze.cell_sets()
+    show_solution = show_solution and maze.solution is not None
+    start, goal = grid.cell(maze.start), grid.cell(maze.goal)
+    current = grid.cell(current_state) if current_state is not None else None
+
+    if np is not None:
+        labels = np.full(grid.width * grid.height, FREE, dtype=np.uint8)
+        if show_explored and explored:
+            labels[np.fromiter(explored, dtype=np.int64, count=len(explored))] = EXPLORED
+        if show_solution and solution:
+            labels[np.fromiter(solution, dtype=np.int64, count=len(solution))] = SOLUTION
+        if current is not None:
+            labels[current] = CURRENT
+        labels[goal] = GOAL
+        labels[start] = START
+        labels[np.frombuffer(grid.cells, dtype=np.uint8) != 0] = WALL
+        return bytearray(labels.tobytes())
+
+    labels = bytearray(grid.width * grid.height)
+    cells = grid.cells
+    for cell in range(grid.width * grid.height):
+        if cells[cell]:
+            labels[cell] = WALL
+        elif cell == start:
+            labels[cell] = START
+        elif cell == goal:
+            labels[cell] = GOAL
+        elif cell == current:
+            labels[cell] = CURRENT
+        elif show_solution and cell in solution:
+            labels[cell] = SOLUTION
+        elif show_explored and cell in explored:
+            labels[cell] = EXPLORED
+        else:
+            labels[cell] = FREE
+    return labels
+
+def _palette():
+    return np.array([color + (255,) for color in COLORS], dtype=np.uint8)
+
+def maze_image(maze, show_solution=True, show_explored=False, current_state=None, cell_size=50, cell_border=2):
+    # Imagen RGBA de todo el laberinto, idéntica a la que dibujaba output_image celda a celda
+    labels = cell_labels(maze, current_state, show_solution, show_explored)
+    width, height = maze.width, maze.height
+
+    if np is None:
+        img = Image.new("RGBA", (width * cell_size, height * cell_size), "black")
+        draw = ImageDraw.Draw(img)
+        for cell, label in enumerate(labels):
+            i, j = divmod(cell, width)
+            draw.rectangle(
+                ([(j * cell_size + cell_border, i * cell_size + cell_border),
+                  ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
+                fill=COLORS[label]
+            )
+        return img
+
+    # Cada celda se amplía a cell_size x cell_size píxeles; los píxeles de borde de cada celda
+    # (los que el rectángulo de output_image no cubría) se pintan de negro por filas y columnas
+    inner = np.zeros(cell_size, dtype=bool)
+    inner[cell_border:cell_size - cell_border + 1] = True
+    index = np.frombuffer(bytes(labels), dtype=np.uint8).reshape(height, width)
+    index = np.repeat(np.repeat(index, cell_size, axis=0), cell_size, axis=1)
+    index[~np.tile(inner, height), :] = BORDER
+    index[:, ~np.tile(inner, width)] = BORDER
+    return Image.fromarray(_palette()[index], "RGBA")
+
+def display_image(labels, width, height, size, border):
+    # Imagen RGB de tamaño `size` con la misma geometría de celdas que MazeRenderer.flush
+    image_width, image_height = size
+    x_bounds = np.arange(width + 1) * image_width // width
+    y_bounds = np.arange(height + 1) * image_height // height
+    xs, ys = np.arange(image_width), np.arange(image_height)
+    cols = np.searchsorted(x_bounds, xs, side="right") - 1
+    rows = np.searchsorted(y_bounds, ys, side="right") - 1
+
+    index = np.frombuffer(bytes(labels), dtype=np.uint8).reshape(height, width)[rows[:, None], cols[None, :]]
+    inner_x = (xs - x_bounds[cols] >= border) & (x_bounds[cols + 1] - 1 - xs >= border)
+    inner_y = (ys - y_bounds[rows] >= border) & (y_bounds[rows + 1] - 1 - ys >= border)
+    index[~inner_y, :] = BORDER
+    index[:, ~inner_x] = BORDER
+    return Image.fromarray(_palette()[index][:, :, :3], "RGB")
+
+class MazeRenderer():
+    # Imagen en memoria del laberinto, dibujada directamente al tamaño de pantalla. Guarda la
+    # etiqueta de cada celda y solo vuelve a pintar las que cambian, sin pasar por disco.
+    def __init__(self, maze, size=(400, 400)):
+        self.maze = maze
+        self.size = size
+        self.image = Image.new("RGB", size, "black")
+        self.draw = ImageDraw.Draw(self.image)
+        self.labels = bytearray(b"\xff") * (maze.width * maze.height)  # 255 = sin pintar
+        self.dirty = set()
+        self.current = None
+
+        # Borde proporcional al de output_image (2 px de cada 50)
+        cell_width, cell_height = size[0] / maze.width, size[1] / maze.height
+        self.border = round(min(cell_width, cell_height) * 2 / 50)
+        self.load(maze)
+
+    def base_label(self, cell):
+        grid = self.maze.walls
+        if grid.cells[cell]:
+            return WALL
+        if cell == grid.cell(self.maze.start):
+            return START
+        if cell == grid.cell(self.maze.goal):
+            return GOAL
+        return FREE
+
+    def set_label(self, cell, label):
+        if self.labels[cell] != label:
+            self.labels[cell] = label
+            self.dirty.add(cell)
+
+    def load(self, maze, current_state=None, show_solution=True, show_explored=True):
+        # Recalcula todas las etiquetas a partir del laberinto; solo se marcan las que cambian
+        self.maze = maze
+        grid = maze.walls
+        self.current = grid.cell(current_state) if current_state is not None else None
+        labels = cell_labels(maze, current_state, show_solution, show_explored)
+
+        if np is not None:
+            changed = np.flatnonzero(np.frombuffer(bytes(labels), dtype=np.uint8)
+                                     != np.frombuffer(bytes(self.labels), dtype=np.uint8))
+            self.labels = labels
+            if len(changed) * 4 > len(labels):
+                # Muchos cambios: repintar el fotograma entero de una vez
+                self.image.paste(display_image(labels, maze.width, maze.height, self.size, self.border))
+                self.dirty.clear()
+            else:
+                self.dirty.update(changed.tolist())
+            return
+
+        for cell, label in enumerate(labels):
+            self.set_label(cell, label)
+
+    def step(self, state):
+        # Un paso de la búsqueda: el estado anterior pasa a explorado y `state` a actual
+        cell = self.maze.walls.cell(state)
+        if self.current is not None and self.labels[self.current] == CURRENT:
+            self.set_label(self.current, EXPLORED)
+        self.current = cell
+        if self.base_label(cell) == FREE:
+            self.set_label(cell, CURRENT)
+
+    def flush(self):
+        # Pinta las celdas pendientes y devuelve cuántas se han pintado
+        width, height = self.maze.width, self.maze.height
+        image_width, image_height = self.size
+        border = self.border
+        for cell in self.dirty:
+            i, j = divmod(cell, width)
+            x0, x1 = j * image_width // width, (j + 1) * image_width // width
+            y0, y1 = i * image_height // height, (i + 1) * image_height // height
+            if x1 <= x0 or y1 <= y0:
+                continue  # Celda de menos de un píxel en pantalla
+            self.draw.rectangle([(x0, y0), (x1 - 1, y1 - 1)], fill=COLORS[BORDER])
+            self.draw.rectangle(
+                [(x0 + border, y0 + border), (max(x0 + border, x1 - 1 - border), max(y0 + border, y1 - 1 - border))],
+                fill=COLORS[self.labels[cell]]
+            )
+        painted = len(self.dirty)
+        self.dirty.clear()
+        return painted
+
+class TracePlayer():
+    # Reproduce una SearchTrace (laberinto.trace) sobre un MazeRenderer. seek() avanza o retrocede
+    # aplicando solo los pasos intermedios, así que cada fotograma repinta lo que cambia.
+    def __init__(self, trace, renderer):
+        self.trace = trace
+        self.renderer = renderer
+        self.position = 0  # Pasos mostrados; el último es el estado actual
+        self.visits = {}  # Celda -> veces expandida entre los pasos mostrados
+        self.solution_shown = False
+
+    def paint(self, cell):
+        renderer = self.renderer
+        base = renderer.base_label(cell)
+        if base != FREE:
+            return
+        if self.position and cell == self.trace.steps[self.position - 1]:
+            renderer.set_label(cell, CURRENT)
+        elif self.visits.get(cell):
+            renderer.set_label(cell, EXPLORED)
+        else:
+            renderer.set_label(cell, FREE)
+
+    def seek(self, position):
+        position = max(0, min(position, len(self.trace)))
+        self.hide_solution()
+        steps = self.trace.steps
+        touched = set()
+        if self.position:
+            touched.add(steps[self.position - 1])
+        if position > self.position:
+            for cell in steps[self.position:position]:
+                self.visits[cell] = self.visits.get(cell, 0) + 1
+                touched.add(cell)
+        else:
+            for cell in steps[position:self.position]:
+                self.visits[cell] -= 1
+                touched.add(cell)
+        self.position = position
+        if position:
+            touched.add(steps[position - 1])
+        for cell in touched:
+            self.paint(cell)
+        self.renderer.current = steps[position - 1] if position else None
+        return self.renderer.flush()
+
+    def step(self, count=1):
+        return self.seek(self.position + count)
+
+    def show_solution(self):
+        for cell in self.trace.solution:
+            if self.renderer.base_label(cell) == FREE:
+                self.renderer.set_label(cell, SOLUTION)
+        self.solution_shown = True
+        return self.renderer.flush()
+
+    def hide_solution(self):
+        if self.solution_shown:
+            self.solution_shown = False
+            for cell in self.trace.solution:
+                self.paint(cell)
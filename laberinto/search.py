@@ -0,0 +1,105 @@
+import time
+from functools import partial
+
+from .bidirectional import bidirectional_astar, bidirectional_bfs
+from .corridors import corridor_search
+from .flat import flat_search
+from .grid import StateSet
+from .jps import jump_point_search
+from .lpa import lpa_search
+from .metrics import SearchMetrics
+from .wavefront import wavefront_search
+
+class SolveResult():
+    def __init__(self, algorithm, actions, cells, explored, num_explored, timings, metrics=None, cost=None):
+        self.algorithm = algorithm
+        self.actions = actions
+        self.cells = cells
+        self.cost = len(actions) if cost is None else cost  # Coste del camino (pasos, sin terreno)
+        self.explored = explored
+        self.num_explored = num_explored
+        self.timings = timings  # Segundos por fase
+        if metrics is None:
+            metrics = SearchMetrics(algorithm, timings)
+            metrics.num_explored = num_explored
+        self.metrics = metrics
+
+    @property
+    def solution(self):
+        return (self.actions, self.cells)  # Mismo formato que Maze.solution
+
+    def __repr__(self):
+        return (f"SolveResult(algorithm={self.algorithm!r}, length={len(self.actions)}, "
+                f"num_explored={self.num_explored})")
+
+# Nombre del algoritmo -> motor(maze, start, goal, step_callback, timings), que devuelve
+# (acciones, celdas, ids de celda explorados, número de estados explorados). Con terreno
+# ponderado, Dijkstra, A* y LPA* dan el camino de menor coste; los demás motores cuentan pasos.
+ALGORITHMS = {
+    "BFS": partial(flat_search, "BFS"),
+    "DFS": partial(flat_search, "DFS"),
+    "Greedy": partial(flat_search, "Greedy"),
+    "A*": partial(flat_search, "A*"),
+    "Dijkstra": partial(flat_search, "Dijkstra"),  # Cola por cubetas (Dial)
+    "Wavefront": wavefront_search,  # BFS vectorizado con NumPy
+    "Bi-BFS": bidirectional_bfs,
+    "Bi-A*": bidirectional_astar,
+    "JPS": jump_point_search,  # Jump Point Search en 4 direcciones
+    "LPA*": lpa_search,  # Desde cero; Maze.replan conserva su estado entre cambios de muros
+}
+
+# Algoritmos que pueden ejecutarse sobre el índice de corredores (solve(..., indexed=True))
+INDEXED_ALGORITHMS = ("BFS", "DFS", "Greedy", "A*")
+
+def solve(maze, algorithm="BFS", start=None, goal=None, step_callback=None, indexed=False,
+          metrics=False, sample=None, sample_every=1000):
+    # metrics=True cuenta además inserciones, extracciones, duplicados y pico de la frontera
+    # (motores BFS/DFS/Greedy/A*/Dijkstra). sample(metrics, state) se llama cada `sample_every`
+    # expansiones con las métricas parciales; sin él no se añade nada al bucle de búsqueda.
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algoritmo desconocido: {algorithm!r}")
+    if indexed and algorithm not in INDEXED_ALGORITHMS:
+        raise ValueError(f"{algorithm} no puede usar el índice de corredores")
+    if indexed and maze.walls.costs is not None:
+        raise ValueError("El índice de corredores no admite terreno ponderado")
+    engine = partial(corridor_search, algorithm) if indexed else ALGORITHMS[algorithm]
+    start = maze.start if start is None else start
+    goal = maze.goal if goal is None else goal
+
+    timings = {}
+    stats = SearchMetrics(algorithm, timings)
+    if metrics and isinstance(engine, partial) and engine.func is flat_search:
+        engine = partial(engine, metrics=stats)
+    if sample is not None:
+        step_callback = sampling_callback(stats, sample, sample_every, step_callback)
+
+    # El índice de componentes solo se consulta si ya existe (Maze.components() lo construye):
+    # compensa cuando se hacen muchas consultas sobre el mismo laberinto, no en una sola
+    index = maze.component_index
+    if index is not None and not index.reachable(maze.walls.cell(start), maze.walls.cell(goal)):
+        raise Exception("no solution")  # Componentes distintas: sin recorrer nada
+
+    search_start = time.perf_counter()
+    actions, cells, explored, num_explored = engine(
+        maze, start, goal, step_callback=step_callback, timings=timings)
+    timings["search"] = time.perf_counter() - search_start - timings.get("path", 0.0)
+    stats.num_explored = num_explored
+    cost = None
+    if maze.walls.costs is not None:
+        cost = sum(maze.walls.costs[maze.walls.cell(state)] for state in cells)
+    return SolveResult(algorithm, actions, cells, StateSet(maze.width, explored), num_explored, timings, stats,
+                       cost)
+
+def sampling_callback(stats, sample, every, step_callback=None):
+    # Envuelve step_callback para llamar a sample cada `every` expansiones
+    count = 0
+
+    def callback(state):
+        nonlocal count
+        count += 1
+        if count % every == 0:
+            stats.num_explored = count
+            sample(stats, state)
+        if step_callback is not None:
+            step_callback(state)
+    return callback
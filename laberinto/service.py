@@ -0,0 +1,320 @@
+"""Servicio local de resolución: HTTP/JSON sobre asyncio, con los laberintos residentes.
+
+    python -m laberinto.service --port 8765 --workers 4
+    curl -s localhost:8765/solve -d '{"maze": "laberinto5.txt", "algorithm": "A*"}'
+    curl -s localhost:8765/stats
+
+POST /solve recibe {"maze", "algorithm", "start", "goal"} (inicio y meta opcionales, como
+[fila, columna]) y devuelve las acciones, las celdas, el coste y los estados explorados. Cada
+laberinto se lee una vez (y otra si cambia el fichero) y su rejilla se comparte con un pool
+de procesos, como en laberinto.batch; las búsquedas corren en el pool y el bucle de eventos
+solo atiende conexiones. Las peticiones idénticas que llegan mientras otra igual está en
+curso esperan su resultado en vez de repetir la búsqueda, y las metas inalcanzables se
+responden sin salir del proceso, con el índice de componentes. GET /stats da la latencia por
+ruta (media y percentiles), los contadores y los laberintos cargados.
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import multiprocessing
+import os
+import signal
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .batch import SharedGrid, _solve_chunk
+from .maze import Maze
+from .search import ALGORITHMS
+
+PORT = 8765
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 422: "Unprocessable Entity"}
+
+class LatencyStats():
+    def __init__(self, window=10000):
+        self.samples = deque(maxlen=window)  # Últimas latencias, para los percentiles
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction):
+        ordered = sorted(self.samples)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)] if ordered else 0.0
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+class ResidentMaze():
+    # Laberinto cargado: el Maze (con su índice de componentes) y su rejilla compartida
+    def __init__(self, path, mtime):
+        self.path = path
+        self.mtime = mtime
+        self.maze = Maze(path)
+        self.maze.components()
+        self.shared = SharedGrid(self.maze.walls, self.maze.component_index)  # Con las etiquetas
+        self.inflight = 0  # Búsquedas en el pool que usan la rejilla compartida
+        self.retired = False  # Sustituido por una versión más nueva del fichero
+
+    def release(self):
+        if self.shared is not None:
+            self.shared.release()
+            self.shared = None
+
+class SolveService():
+    def __init__(self, root=".", workers=None):
+        self.root = os.path.realpath(root)
+        # Sin fork: el proceso ya tiene hilos (las cargas) cuando el pool crea sus procesos
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self.pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                        mp_context=multiprocessing.get_context(method))
+        self.mazes = {}  # Ruta -> ResidentMaze
+        self.draining = set()  # ResidentMaze sustituidos que aún tienen búsquedas en el pool
+        self.loading = {}  # (ruta, fecha de modificación) -> tarea de carga en curso
+        self.inflight = {}  # (ruta, fecha, inicio, meta, algoritmo) -> tarea de búsqueda en curso
+        self.latency = {}  # Ruta HTTP -> LatencyStats
+        self.counters = {"requests": 0, "solved": 0, "coalesced": 0, "unreachable": 0, "errors": 0}
+
+    def resolve(self, name):
+        # Nombre de fichero relativo a la raíz del servicio, sin salir de ella
+        path = os.path.realpath(os.path.join(self.root, name))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"{name!r} está fuera de {self.root}")
+        return path
+
+    async def resident(self, name):
+        path = self.resolve(name)
+        mtime = os.path.getmtime(path)  # FileNotFoundError si no existe
+        current = self.mazes.get(path)
+        if current is not None and current.mtime == mtime:
+            return current
+
+        key = (path, mtime)
+        task = self.loading.get(key)
+        if task is None:
+            loop = asyncio.get_running_loop()
+            task = self.loading[key] = asyncio.ensure_future(loop.run_in_executor(None, ResidentMaze, path, mtime))
+            task.add_done_callback(lambda _: self.loading.pop(key, None))
+        resident = await asyncio.shield(task)
+
+        current = self.mazes.get(path)
+        if current is resident:
+            return resident
+        if current is None or current.mtime < resident.mtime:
+            self.mazes[path] = resident
+            if current is not None:
+                self.retire(current)
+            return resident
+        # Mientras se cargaba, otra petición instaló una versión más nueva: esta sobra
+        self.retire(resident)
+        return current
+
+    def retire(self, resident):
+        # La rejilla vieja se libera cuando terminan las búsquedas que la usan
+        resident.retired = True
+        if resident.inflight == 0:
+            resident.release()
+        else:
+            self.draining.add(resident)
+
+    async def solve(self, payload):
+        algorithm = payload.get("algorithm", "BFS")
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Algoritmo desconocido: {algorithm!r}")
+        resident = await self.resident(payload["maze"])
+        maze = resident.maze
+        start = tuple(payload["start"]) if payload.get("start") is not None else maze.start
+        goal = tuple(payload["goal"]) if payload.get("goal") is not None else maze.goal
+        for row, col in (start, goal):
+            if not (0 <= row < maze.height and 0 <= col < maze.width):
+                raise ValueError(f"Celda fuera del laberinto: {(row, col)}")
+
+        key = (resident.path, resident.mtime, start, goal, algorithm)
+        task = self.inflight.get(key)
+        coalesced = task is not None
+        if coalesced:
+            self.counters["coalesced"] += 1
+        else:
+            resident.inflight += 1  # Antes de ceder el control, para que no se libere la rejilla
+            task = self.inflight[key] = asyncio.ensure_future(self.compute(resident, start, goal, algorithm))
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        # shield: si el cliente se desconecta, la búsqueda sigue para los demás que la esperan
+        result = await asyncio.shield(task)
+        return dict(result, coalesced=coalesced)
+
+    async def compute(self, resident, start, goal, algorithm):
+        # resident.inflight ya cuenta esta búsqueda (ver solve)
+        try:
+            walls = resident.maze.walls
+            if not resident.maze.components().reachable(walls.cell(start), walls.cell(goal)):
+                self.counters["unreachable"] += 1
+                raise Exception("no solution")
+            shared = resident.shared
+            loop = asyncio.get_running_loop()
+            [(_, result, error)] = await loop.run_in_executor(
+                self.pool, _solve_chunk, shared.name, shared.width, shared.height, shared.weighted,
+                [(0, start, goal, algorithm)], False, shared.components)
+        finally:
+            resident.inflight -= 1
+            if resident.retired and resident.inflight == 0:
+                resident.release()
+                self.draining.discard(resident)
+        if error is not None:
+            raise Exception(error)
+        self.counters["solved"] += 1
+        return {
+            "maze": os.path.relpath(resident.path, self.root),
+            "algorithm": algorithm,
+            "start": list(start),
+            "goal": list(goal),
+            "actions": result.actions,
+            "cells": [list(state) for state in result.cells],
+            "cost": result.cost,
+            "num_explored": result.num_explored,
+            "timings": result.timings,
+        }
+
+    def stats(self):
+        return {
+            "latency": {route: stats.to_dict() for route, stats in self.latency.items()},
+            "counters": self.counters,
+            "mazes": [{"maze": os.path.relpath(path, self.root), "width": resident.maze.width,
+                       "height": resident.maze.height, "components": len(resident.maze.components())}
+                      for path, resident in self.mazes.items()],
+            "inflight": len(self.inflight),
+        }
+
+    async def dispatch(self, method, route, body):
+        # Devuelve (estado HTTP, objeto JSON de la respuesta)
+        if route == "/stats":
+            return (200, self.stats()) if method == "GET" else (405, {"error": "usa GET"})
+        if route != "/solve":
+            return 404, {"error": f"ruta desconocida: {route}"}
+        if method != "POST":
+            return 405, {"error": "usa POST"}
+        try:
+            payload = json.loads(body or b"{}")
+            return 200, await self.solve(payload)
+        except FileNotFoundError as e:
+            return 404, {"error": f"no existe el laberinto {e.filename}"}
+        except KeyError as e:
+            return 400, {"error": f"falta el campo {e.args[0]!r}"}
+        except (ValueError, TypeError) as e:  # Incluye JSON mal formado
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 422, {"error": str(e)}
+
+    async def handle(self, reader, writer):
+        # Una conexión HTTP/1.1, con keep-alive: atiende peticiones hasta que el cliente cierra
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, target, version = line.decode("latin-1").split()
+                except ValueError:
+                    await self.respond(writer, 400, {"error": "petición mal formada"}, close=True)
+                    break
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+                close = headers.get("connection", "").lower() == "close" or version == "HTTP/1.0"
+
+                begin = time.perf_counter()
+                route = target.split("?", 1)[0]
+                self.counters["requests"] += 1
+                status, payload = await self.dispatch(method, route, body)
+                elapsed = time.perf_counter() - begin
+                if status != 200:
+                    self.counters["errors"] += 1
+                if route in ("/solve", "/stats"):
+                    self.latency.setdefault(route, LatencyStats()).record(elapsed)
+                if route == "/solve" and status == 200:
+                    payload["seconds"] = elapsed
+                await self.respond(writer, status, payload, close)
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # El cliente cerró a mitad de petición
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, close=False):
+        data = json.dumps(payload).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n" + ("Connection: close\r\n" if close else "") + "\r\n")
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def start(self, host="127.0.0.1", port=PORT):
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+        for resident in [*self.mazes.values(), *self.draining]:
+            resident.release()
+        self.mazes.clear()
+        self.draining.clear()
+
+def request(method, route, payload=None, host="127.0.0.1", port=PORT):
+    # Cliente mínimo (síncrono) para scripts y pruebas en localhost: devuelve (estado, JSON)
+    connection = http.client.HTTPConnection(host, port)
+    try:
+        body = json.dumps(payload) if payload is not None else None
+        connection.request(method, route, body, {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b"null")
+    finally:
+        connection.close()
+
+async def serve(host, port, root, workers):
+    service = SolveService(root, workers)
+    server = await service.start(host, port)
+    print(f"Escuchando en http://{host}:{port} (laberintos en {service.root})")
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)  # Cerrar limpio: pool y memoria compartida
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C sigue llegando como KeyboardInterrupt
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        service.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio local de resolución de laberintos")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--root", default=".", help="directorio de los ficheros de laberinto")
+    parser.add_argument("--workers", type=int, help="procesos del pool (por defecto, uno por CPU)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.root, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
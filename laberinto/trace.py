@@ -0,0 +1,151 @@
+import struct
+from array import array
+
+from .corridors import cell_actions
+from .grid import StateSet
+from .search import SolveResult
+
+# Trazas de búsqueda: las expansiones en orden (las que ve step_callback), el conjunto
+# explorado y la solución de una ejecución, para reproducirla sin volver a buscar. En disco
+# los ids de celda van como diferencias con el anterior en zigzag + varint (LEB128), así que
+# los pasos entre celdas vecinas ocupan uno o dos bytes.
+
+MAGIC = b"LTR\x02"
+HEADER = struct.Struct("<4s6QH")  # magic, ancho, alto, inicio, meta, explorados, coste, len(nombre)
+
+def encode_deltas(values, out):
+    previous = 0
+    for value in values:
+        delta = value - previous
+        previous = value
+        zigzag = delta * 2 if delta >= 0 else -delta * 2 - 1
+        while zigzag >= 0x80:
+            out.append((zigzag & 0x7F) | 0x80)
+            zigzag >>= 7
+        out.append(zigzag)
+
+def decode_deltas(data, offset, count):
+    values = array("Q")
+    previous = 0
+    for _ in range(count):
+        zigzag = shift = 0
+        while True:
+            byte = data[offset]
+            offset += 1
+            zigzag |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        previous += zigzag >> 1 if not zigzag & 1 else -((zigzag + 1) >> 1)
+        values.append(previous)
+    return values, offset
+
+class TraceSteps():
+    # Vista de los pasos de una traza como estados (fila, columna), sin convertirlos todos
+    def __init__(self, width, cells):
+        self.width = width
+        self.cells = cells
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [divmod(cell, self.width) for cell in self.cells[index]]
+        return divmod(self.cells[index], self.width)
+
+class SearchTrace():
+    def __init__(self, width, height, algorithm, start, goal, steps, explored, solution, num_explored, cost=None):
+        self.width = width
+        self.height = height
+        self.algorithm = algorithm
+        self.start = start  # Ids de celda
+        self.goal = goal
+        self.steps = steps  # array de ids expandidos, en orden
+        self.explored = explored  # array de ids explorados al terminar, ordenado
+        self.solution = solution  # array de ids del camino (sin el inicio)
+        self.num_explored = num_explored
+        self.cost = len(solution) if cost is None else cost  # Coste del camino (con terreno)
+
+    @classmethod
+    def record(cls, maze, algorithm="BFS", **options):
+        steps = array("Q")
+        width = maze.width
+        result = maze.solve(step_callback=lambda state: steps.append(state[0] * width + state[1]),
+                            algorithm=algorithm, **options)
+        return cls.from_result(maze, result, steps)
+
+    @classmethod
+    def from_run(cls, run):
+        # Traza de un SearchRun (laberinto.animation) ya terminado
+        if run.result is None:
+            raise Exception("la búsqueda no terminó con solución")
+        width = run.maze.width
+        steps = array("Q", (row * width + col for row, col in run.steps))
+        return cls.from_result(run.maze, run.result, steps)
+
+    @classmethod
+    def from_result(cls, maze, result, steps):
+        grid = maze.walls
+        explored = result.explored.cells if isinstance(result.explored, StateSet) else map(grid.cell, result.explored)
+        return cls(maze.width, maze.height, result.algorithm, grid.cell(maze.start), grid.cell(maze.goal),
+                   steps, array("Q", sorted(explored)), array("Q", map(grid.cell, result.cells)),
+                   result.num_explored, result.cost)
+
+    def __len__(self):
+        return len(self.steps)
+
+    def states(self):
+        return TraceSteps(self.width, self.steps)
+
+    def result(self):
+        cells = list(self.solution)
+        return SolveResult(self.algorithm, cell_actions(self.width, self.start, cells),
+                           [divmod(cell, self.width) for cell in cells],
+                           StateSet(self.width, set(self.explored)), self.num_explored, {}, cost=self.cost)
+
+    def apply(self, maze):
+        # Deja el laberinto como si acabara de resolverse con esta traza
+        if (maze.width, maze.height) != (self.width, self.height):
+            raise ValueError("La traza es de un laberinto de otro tamaño")
+        result = self.result()
+        maze.solution = result.solution
+        maze.explored = result.explored
+        maze.num_explored = result.num_explored
+        return result
+
+    def to_bytes(self):
+        name = self.algorithm.encode("utf-8")
+        out = bytearray(HEADER.pack(MAGIC, self.width, self.height, self.start, self.goal,
+                                    self.num_explored, self.cost, len(name)))
+        out += name
+        for values in (self.steps, self.explored, self.solution):
+            encode_deltas((len(values),), out)
+            encode_deltas(values, out)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, width, height, start, goal, num_explored, cost, name_length = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise Exception("no es una traza de búsqueda")
+        offset = HEADER.size + name_length
+        algorithm = bytes(data[HEADER.size:offset]).decode("utf-8")
+        arrays = []
+        for _ in range(3):
+            (count,), offset = decode_deltas(data, offset, 1)
+            values, offset = decode_deltas(data, offset, count)
+            arrays.append(values)
+        return cls(width, height, algorithm, start, goal, *arrays, num_explored, cost)
+
+    def save(self, filename):
+        with open(filename, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def __repr__(self):
+        return f"SearchTrace({self.algorithm!r}, {len(self.steps)} pasos, camino de {len(self.solution)})"
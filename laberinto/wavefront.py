@@ -0,0 +1,90 @@
+import time
+
+from .grid import UP, DOWN, LEFT, RIGHT
+
+# (bit de vecino libre, acción que lleva hasta ese vecino)
+_MOVES = ((UP, "up"), (DOWN, "down"), (LEFT, "left"), (RIGHT, "right"))
+_OPPOSITE = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("El motor Wavefront necesita NumPy (pip install numpy)") from None
+    return numpy
+
+def distance_field(grid, source, target=None, step_callback=None):
+    # Campo de distancias BFS desde el id de celda `source`, calculado por niveles sobre arrays
+    # de NumPy. Si se da `target`, se detiene en el nivel que lo alcanza, y de ese nivel solo
+    # se notifica `target` (como BFS, que se para al sacar la meta de la cola).
+    # Devuelve un array plano (int32, -1 = inalcanzable) indexado por id de celda.
+    np = _numpy()
+    open_mask = np.frombuffer(grid.open, dtype=np.uint8)
+    deltas = {UP: -grid.width, DOWN: grid.width, LEFT: -1, RIGHT: 1}
+
+    dist = np.full(grid.width * grid.height, -1, dtype=np.int32)
+    dist[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    level = 0
+    while frontier.size:
+        if target is not None and dist[target] >= 0:
+            if step_callback:
+                step_callback(target)
+            break
+        if step_callback:
+            for cell in frontier.tolist():
+                step_callback(cell)
+
+        masks = open_mask[frontier]
+        candidates = np.concatenate([frontier[(masks & bit) != 0] + delta for bit, delta in deltas.items()])
+        candidates = candidates[dist[candidates] < 0]
+        frontier = np.unique(candidates)
+        level += 1
+        dist[frontier] = level
+    return dist
+
+def path_from_field(grid, dist, target):
+    # Reconstruye (acciones, ids de celda) descendiendo por el campo desde `target` hasta la fuente
+    if dist[target] < 0:
+        raise Exception("no solution")
+    open_mask, width = grid.open, grid.width
+    deltas = {UP: -width, DOWN: width, LEFT: -1, RIGHT: 1}
+
+    actions = []
+    cells = []
+    cell = target
+    level = int(dist[target])
+    while level > 0:
+        for bit, action in _MOVES:
+            if open_mask[cell] & bit and dist[cell + deltas[bit]] == level - 1:
+                actions.append(_OPPOSITE[action])
+                cells.append(cell)
+                cell += deltas[bit]
+                break
+        level -= 1
+    actions.reverse()
+    cells.reverse()
+    return actions, cells
+
+def wavefront_search(maze, start, goal, step_callback=None, timings=None):
+    np = _numpy()
+    grid = maze.walls
+    start, goal = grid.cell(start), grid.cell(goal)
+
+    callback = None
+    if step_callback:
+        def callback(cell):
+            step_callback(divmod(cell, grid.width))
+
+    dist = distance_field(grid, start, target=goal, step_callback=callback)
+    if dist[goal] < 0:
+        raise Exception("no solution")
+
+    path_start = time.perf_counter()
+    actions, cells = path_from_field(grid, dist, goal)
+    if timings is not None:
+        timings["path"] = time.perf_counter() - path_start
+
+    # Explorados: los niveles completos anteriores al de la meta, como en BFS
+    explored = set(np.flatnonzero((dist >= 0) & (dist < dist[goal])).tolist())
+    return actions, [divmod(cell, grid.width) for cell in cells], explored, len(explored) + 1
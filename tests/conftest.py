@@ -0,0 +1,35 @@
+import os
+import random
+import sys
+
+# El paquete laberinto vive en la raíz del repositorio, sin instalar
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from laberinto import Maze, solve  # noqa: E402
+from laberinto.grid import Grid  # noqa: E402
+
+# Laberintos aleatorios para las pruebas de índices que se corrigen al cambiar muros
+
+def random_maze(seed, weighted=False):
+    rnd = random.Random(seed)
+    width, height = rnd.randint(2, 16), rnd.randint(2, 16)
+    cells = bytearray(1 if rnd.random() < 0.35 else 0 for _ in range(width * height))
+    costs = bytearray(rnd.randint(1, 9) for _ in range(width * height)) if weighted else None
+    start, goal = rnd.sample(range(width * height), 2)
+    cells[start] = cells[goal] = 0
+    return Maze.from_grid(Grid(width, height, cells, costs=costs), divmod(start, width), divmod(goal, width))
+
+def random_toggles(maze, rnd, count):
+    for _ in range(count):
+        state = divmod(rnd.randrange(maze.width * maze.height), maze.width)
+        if state not in (maze.start, maze.goal):
+            maze.toggle_wall(state)
+            yield state
+
+def fresh_cost(maze):
+    # Búsqueda completa en un Maze sin índices, para no dar por buena la respuesta del índice
+    try:
+        return solve(Maze.from_grid(maze.walls, maze.start, maze.goal), algorithm="Dijkstra").cost
+    except Exception as e:
+        assert str(e) == "no solution"
+        return None
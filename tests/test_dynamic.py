@@ -0,0 +1,30 @@
+import random
+
+import pytest
+
+from conftest import fresh_cost, random_maze, random_toggles
+from laberinto.components import ComponentIndex
+
+# Índice de componentes conexas que se corrige al cambiar muros, comparado con el que se
+# obtiene etiquetando de nuevo tras cada cambio
+
+def partition(index):
+    # Componentes como conjuntos de celdas, sin depender de qué etiqueta lleve cada una
+    groups = {}
+    for cell, label in enumerate(index.labels):
+        if label >= 0:
+            groups.setdefault(label, set()).add(cell)
+    for label, cells in groups.items():
+        assert index.sizes[label] == len(cells)
+    assert len(index) == len(groups)
+    return sorted(sorted(cells) for cells in groups.values())
+
+@pytest.mark.parametrize("seed", range(40))
+def test_components_follow_wall_toggles(seed):
+    maze = random_maze(seed)
+    index = maze.components()
+    rnd = random.Random(seed)
+    for _ in random_toggles(maze, rnd, 80):
+        assert partition(index) == partition(ComponentIndex(maze.walls))
+    start, goal = maze.walls.cell(maze.start), maze.walls.cell(maze.goal)
+    assert index.reachable(start, goal) == (fresh_cost(maze) is not None)
@@ -0,0 +1,28 @@
+import random
+
+import pytest
+
+from conftest import fresh_cost, random_maze, random_toggles
+from laberinto import solve
+
+# Maze.replan (LPA* que se conserva entre cambios de muros), comparado con una búsqueda desde
+# cero tras cada tanda de cambios
+
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("seed", range(25))
+def test_replan_matches_fresh_search(seed, weighted):
+    maze = random_maze(seed, weighted)
+    rnd = random.Random(seed)
+    for _ in range(8):
+        list(random_toggles(maze, rnd, 3))
+        expected = fresh_cost(maze)
+        if expected is None:
+            with pytest.raises(Exception, match="no solution"):
+                maze.replan()
+            continue
+        result = maze.replan()
+        assert result.cost == expected
+        if not weighted:
+            assert len(result.actions) == len(solve(maze, algorithm="BFS").actions)
+        assert result.cells[-1] == maze.goal
+        assert all(not maze.walls.is_wall(maze.walls.cell(state)) for state in result.cells)
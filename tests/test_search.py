@@ -0,0 +1,18 @@
+import os
+
+import pytest
+
+from laberinto import ALGORITHMS, Maze, solve
+
+# step_callback recibe exactamente los estados que cuenta num_explored, en todos los motores
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.mark.parametrize("level", range(1, 6))
+@pytest.mark.parametrize("algorithm", list(ALGORITHMS))
+def test_step_callback_matches_num_explored(algorithm, level):
+    maze = Maze(os.path.join(ROOT, f"laberinto{level}.txt"))
+    steps = []
+    result = solve(maze, algorithm=algorithm, step_callback=steps.append)
+    assert len(steps) == result.num_explored
+    assert steps[0] == maze.start
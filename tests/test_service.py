@@ -0,0 +1,125 @@
+import asyncio
+import os
+
+from laberinto.service import ResidentMaze, SolveService, request
+
+# El servicio HTTP en un puerto libre, con un pool pequeño y laberintos en un directorio temporal
+
+LEVEL = """#####B#
+##### #
+####  #
+#### ##
+     ##
+A######
+"""
+
+CLOSED = """A#B
+ # 
+"""
+
+def open_maze(size):
+    # Sala sin muros, de una esquina a la opuesta
+    rows = [" " * size for _ in range(size)]
+    rows[0] = "A" + rows[0][1:]
+    rows[-1] = rows[-1][:-1] + "B"
+    return "\n".join(rows) + "\n"
+
+def run_service(tmp_path, scenario):
+    (tmp_path / "nivel.txt").write_text(LEVEL)
+    (tmp_path / "cerrado.txt").write_text(CLOSED)
+    (tmp_path / "sala.txt").write_text(open_maze(60))
+
+    async def main():
+        service = SolveService(tmp_path, workers=2)
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        loop = asyncio.get_running_loop()
+
+        def call(method, route, payload=None):
+            # El cliente es síncrono: se ejecuta en un hilo para no bloquear el servidor
+            return loop.run_in_executor(None, lambda: request(method, route, payload, port=port))
+
+        try:
+            async with server:
+                return await scenario(service, call)
+        finally:
+            service.close()
+    return asyncio.run(main())
+
+def test_identical_requests_are_coalesced(tmp_path):
+    async def scenario(service, call):
+        # Todas esperan la misma carga y se reanudan juntas: la primera lanza la búsqueda
+        payload = {"maze": "sala.txt", "algorithm": "BFS"}
+        results = await asyncio.gather(*(service.solve(dict(payload)) for _ in range(5)))
+        status, stats = await call("GET", "/stats")
+        return results, status, stats
+
+    results, status, stats = run_service(tmp_path, scenario)
+    assert [result["coalesced"] for result in results] == [False, True, True, True, True]
+    assert len({tuple(map(tuple, result["cells"])) for result in results}) == 1
+    assert len(results[0]["actions"]) == 2 * 59
+    assert status == 200
+    assert stats["counters"]["solved"] == 1
+    assert stats["counters"]["coalesced"] == 4
+    assert stats["inflight"] == 0
+
+def test_stats_report_latency_and_mazes(tmp_path):
+    async def scenario(service, call):
+        solved = await call("POST", "/solve", {"maze": "nivel.txt", "algorithm": "A*"})
+        stats = await call("GET", "/stats")
+        return solved, stats
+
+    (status, result), (stats_status, stats) = run_service(tmp_path, scenario)
+    assert status == 200
+    assert result["maze"] == "nivel.txt"
+    assert result["start"] == [5, 0] and result["goal"] == [0, 5]
+    assert result["cells"][-1] == [0, 5]
+    assert result["cost"] == len(result["actions"])
+    assert stats_status == 200
+    assert stats["latency"]["/solve"]["count"] == 1
+    assert stats["counters"]["requests"] == 2
+    assert stats["mazes"] == [{"maze": "nivel.txt", "width": 7, "height": 6, "components": 1}]
+
+def test_error_paths(tmp_path):
+    async def scenario(service, call):
+        return [
+            await call("POST", "/solve", {"algorithm": "BFS"}),
+            await call("POST", "/solve", {"maze": "nivel.txt", "algorithm": "Nadie"}),
+            await call("POST", "/solve", {"maze": "nivel.txt", "goal": [9, 9]}),
+            await call("POST", "/solve", {"maze": "../fuera.txt"}),
+            await call("POST", "/solve", {"maze": "no_existe.txt"}),
+            await call("GET", "/otra"),
+            await call("GET", "/solve"),
+            await call("POST", "/solve", {"maze": "cerrado.txt"}),
+            await call("GET", "/stats"),
+        ]
+
+    *responses, (_, stats) = run_service(tmp_path, scenario)
+    assert [status for status, _ in responses] == [400, 400, 400, 400, 404, 404, 405, 422]
+    assert all("error" in body for _, body in responses)
+    assert responses[7][1]["error"] == "no solution"
+    assert stats["counters"]["errors"] == 8
+    assert stats["counters"]["unreachable"] == 1
+    assert stats["counters"]["solved"] == 0
+
+def test_stale_load_is_released(tmp_path, monkeypatch):
+    released = []
+    release = ResidentMaze.release
+
+    def recording_release(resident):
+        released.append(resident)
+        release(resident)
+    monkeypatch.setattr(ResidentMaze, "release", recording_release)
+
+    async def scenario(service, call):
+        # Ya hay instalada una versión más nueva que la que se lee ahora del disco
+        path = service.resolve("nivel.txt")
+        newer = service.mazes[path] = ResidentMaze(path, os.path.getmtime(path) + 10)
+        resident = await service.resident("nivel.txt")
+        return newer, resident, list(service.mazes.values())
+
+    newer, resident, installed = run_service(tmp_path, scenario)
+    assert resident is newer
+    assert installed == [newer]
+    assert len(released) == 2 and released[0] is not newer and released[0].shared is None
+    assert newer.shared is None  # Liberado por close()